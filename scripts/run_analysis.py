@@ -67,7 +67,7 @@ def main():
         
         # Show file locations
         print(f"\n📋 Generated files:")
-        print(f"   • trend_results.csv - {result.total_insights} insights with trend scores")
+        print(f"   • {result.trend_results_filename} - {result.total_insights} insights with trend scores")
         print(f"   • query_results.csv - Search query breakdown") 
         print(f"   • youtube_log.csv - {len(result.youtube_log_df)} video details")
         print(f"   • ai_prompt.txt - AI-generated search queries")
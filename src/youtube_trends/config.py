@@ -23,6 +23,9 @@ class Config:
     # Claude API Settings
     CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
     CLAUDE_MAX_TOKENS = 1000
+    CLAUDE_CHUNK_MAX_TOKENS = 4000       # one response carries insights for all five categories
+    CLAUDE_BATCH_POLL_INTERVAL = 20      # seconds before first Message Batches status check
+    CLAUDE_BATCH_MAX_POLL_INTERVAL = 300 # cap on backoff between batch status checks
     CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY_ENV")
     
     # YouTube API Settings  
@@ -42,7 +45,17 @@ class Config:
     # Transcript Processing
     TRANSCRIPT_MAX_CHUNK_SIZE = 4000  # characters
     TRANSCRIPT_OVERLAP_SIZE = 200     # characters
+    TRANSCRIPT_MAX_TOKENS = 8000      # token budget per chunk when chunking by tokens
+    TRANSCRIPT_MIN_TAIL_FRACTION = 0.15  # final chunks shorter than this share of max size join the previous chunk
     TRANSCRIPT_MIN_SENTENCE_LENGTH = 10  # characters for sentence splitting
+    TRANSCRIPT_CACHE_MAX_ENTRIES = 1000  # cached transcripts kept before evicting least recently used
+    TRANSCRIPT_CACHE_EVICT_TO = 0.9      # eviction trims to this fraction of the limit, so it runs rarely
+    TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE", "1") != "0"  # set to 0 to always re-extract
+    CLAUDE_RESPONSE_CACHE_MAX_ENTRIES = 50000  # cached chunk responses kept before evicting the oldest
+    CLAUDE_RESPONSE_CACHE_EVICT_TO = 0.9  # eviction trims to this fraction of the limit, so it runs rarely
+    CLAUDE_RESPONSE_CACHE_TTL = 30 * 24 * 3600  # seconds a cached chunk response stays valid
+    CLAUDE_RESPONSE_CACHE_BUSY_TIMEOUT = 30.0  # seconds a write waits on another process's lock
+    CLAUDE_RESPONSE_CACHE_ENABLED = os.getenv("CLAUDE_RESPONSE_CACHE", "1") != "0"  # set to 0 to always call Claude
     
     # Query Generation
     QUERY_WORD_LIMIT = 8           # maximum words per query
@@ -51,6 +64,8 @@ class Config:
     # Video Processing
     DEFAULT_MAX_VIDEOS = 25         # default number of videos to process
     DEFAULT_VIDEO_SEARCH_LIMIT = 10 # default YouTube search limit
+    YOUTUBE_SEARCH_CONCURRENCY = 8  # maximum in-flight search requests in a batch
+    YOUTUBE_VIDEOS_LIST_MAX_IDS = 50  # videos.list accepts at most 50 IDs per call
     VIDEOS_PER_QUERY = 5           # videos to search per query
     USE_MULTIPLE_QUERIES = True    # whether to use multiple queries or just first one
     
@@ -58,6 +73,19 @@ class Config:
     MAX_PARALLEL_VIDEOS = 8        # maximum videos to process concurrently
     ENABLE_PARALLEL_PROCESSING = True  # whether to use parallel processing
     PARALLEL_TIMEOUT = 500         # timeout per video processing in seconds
+    MAX_CONCURRENT_LLM = 10        # maximum in-flight extraction calls per transcript
+    TRANSCRIPT_FETCH_CONCURRENCY = 20  # maximum in-flight transcript downloads in a batch
+    
+    # Network Retries
+    NETWORK_RETRY_ATTEMPTS = 3     # total attempts for transient transcript/Claude failures
+    NETWORK_RETRY_INITIAL_WAIT = 1.0  # seconds before first retry (exponential with jitter)
+    NETWORK_RETRY_MAX_WAIT = 10.0  # cap on wait between retries in seconds
+    CLAUDE_RETRY_ATTEMPTS = 6      # attempts per Claude extraction call (429/5xx/connection errors)
+    CLAUDE_RETRY_MAX_WAIT = 30.0   # cap on wait between Claude retries in seconds
+    
+    # Claude Rate Limits (match the API key's tier)
+    CLAUDE_REQUESTS_PER_MINUTE = 50
+    CLAUDE_INPUT_TOKENS_PER_MINUTE = 40000
     
     # Scoring System
     TREND_SCORE_MIN = -1.0         # minimum trend score (declining)
@@ -69,27 +97,41 @@ class Config:
     # =============================================================================
     
     # Directory Structure
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
     RESULTS_BASE_DIR = "results"
+    CACHE_DIR = os.getenv("YOUTUBE_TRENDS_CACHE_DIR", os.path.join(PROJECT_ROOT, "cache"))  # git-ignored
     TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
     DATE_FORMAT = "%Y-%m-%d"
     YOUTUBE_DATE_SUFFIX = "T00:00:00Z"
+    TRANSCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, "transcript_insights")  # Extracted insights keyed by transcript hash
+    CLAUDE_RESPONSE_CACHE_PATH = os.path.join(CACHE_DIR, "claude_responses.sqlite3")  # Raw Claude replies keyed by chunk hash
     
     # File Names
     FILES = {
         "prompt": "prompt.txt",
         "ai_prompt": "ai_prompt.txt", 
         "trend_results": "trend_results.csv",
+        "trend_results_parquet": "trend_results.parquet",
         "youtube_log": "youtube_log.csv",
         "query_results": "query_results.csv",
+        "ingested_runs": "_ingested.json",
+        "metadata_backfill_marker": "_metadata_backfilled",
+        "score_column": "_scores.npz",
+        "embeddings_cache": "embeddings.npy",  # normalized embeddings, memory-mapped by the explorer
+        "embeddings_index": "embeddings_index.json",
         "errors": "errors.txt"
     }
     
     # File Extensions
     EXTENSIONS = {
         "text": ".txt",
-        "csv": ".csv"
+        "csv": ".csv",
+        "parquet": ".parquet"
     }
     
+    # Trend results serialization ("csv" or "parquet"); downstream tools read trend_results.csv
+    DEFAULT_RESULTS_FORMAT = "csv"
+    
     # =============================================================================
     # DISPLAY & FORMATTING
     # =============================================================================
@@ -268,6 +310,11 @@ JSON format:
     EMBEDDING_BATCH_SIZE = 100
     EMBEDDING_MAX_RETRIES = 3
     EMBEDDING_RETRY_DELAY = 1.0  # seconds
+    VECTOR_DB_ADD_BATCH_SIZE = 512  # documents per collection.add call
+    VECTOR_DB_QUERY_CACHE_SIZE = 256  # query embeddings kept in memory per database
+    VECTOR_DB_SEARCH_CACHE_SIZE = 512  # formatted search results kept in memory per database
+    VECTOR_DB_MAX_LOAD_WORKERS = 16   # threads reading run result files in parallel
+    VECTOR_DB_FINGERPRINT_TAIL = 64  # newest IDs hashed to detect rows written outside TrendsVectorDB
     
     # Trend Aggregation Settings
     TREND_SIMILARITY_THRESHOLD = 0.85  # For deduplication
@@ -278,6 +325,16 @@ JSON format:
     VECTOR_SEARCH_TOP_K = 20          # Default number of results to return
     VECTOR_SEARCH_SCORE_THRESHOLD = 0.7  # Minimum similarity score for relevance
     
+    # Semantic Region Clustering
+    CLUSTERING_DENSE_MATRIX_MAX_BYTES = 1024 ** 3  # largest N x N distance matrix built for OPTICS
+    CLUSTERING_SILHOUETTE_SAMPLE_SIZE = 2000  # points in the shared silhouette subsample (silhouette is O(N^2))
+    CLUSTERING_KDIST_MAX_NEIGHBORS = 20       # largest min_samples in the sweep; one k-NN fit covers smaller k
+    CLUSTERING_EARLY_STOP_SILHOUETTE = 0.45   # adaptive search stops at the first candidate this good...
+    CLUSTERING_EARLY_STOP_MIN_CLUSTERS = 3    # ...with at least this many clusters
+    CLUSTERING_ADAPTIVE_N_JOBS = -1           # worker processes for the adaptive sweep (-1 = all cores)
+    CLUSTERING_SKLEARN_N_JOBS = -1            # threads for sklearn neighbor queries outside the sweep (-1 = all cores)
+    CLUSTERING_HNSW_QUERY_BATCH_SIZE = 1000   # query vectors per ChromaDB request when reading k-distances
+    
     # Metadata Fields for Trends
     TREND_METADATA_FIELDS = [
         "category",           # early_adopter_products, emerging_topics, etc.
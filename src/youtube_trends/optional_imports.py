@@ -0,0 +1,14 @@
+"""Optional accelerator dependencies with their fallbacks, imported from one place."""
+
+import json
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; callers fall back to plain NumPy when njit is None
+    njit = None
+
+try:
+    import orjson
+    json_loads = orjson.loads  # raises orjson.JSONDecodeError, a json.JSONDecodeError subclass
+except ImportError:  # orjson is optional; fall back to the standard library
+    json_loads = json.loads
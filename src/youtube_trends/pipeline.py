@@ -1,21 +1,61 @@
 """Sophisticated end-to-end YouTube trends analysis pipeline."""
 
 import logging
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+import queue
 import time
 import os
 
+from tenacity import (
+    retry, stop_after_attempt, wait_exponential_jitter,
+    retry_if_exception_type, retry_if_not_exception_type
+)
+from tqdm import tqdm
+
 from .config import Config
 from .youtube_query_generation import YouTubeQueryGenerator, QueryGenerationError
 from .youtube_search import YouTubeSearchClient, SearchError
-from .transcript import YouTubeTranscriptClient, TranscriptError
-from .transcript_processing_claude import ClaudeTranscriptProcessor, TranscriptProcessingError
+from .transcript import (
+    YouTubeTranscriptClient, TranscriptError,
+    TranscriptNotAvailableError, VideoNotFoundError
+)
+from .transcript_processing_claude import ClaudeTranscriptProcessor, TranscriptProcessingError, CATEGORY_NAMES
+from .optional_imports import njit
 
 logger = logging.getLogger(__name__)
 
+# Retry transient transcript download failures; missing/disabled transcripts are permanent.
+# Claude calls are not retried here: the processor already retries rate-limit, overload,
+# connection and timeout errors per chunk, and its other failures are permanent
+_retry_transient = retry(
+    stop=stop_after_attempt(Config.NETWORK_RETRY_ATTEMPTS),
+    wait=wait_exponential_jitter(initial=Config.NETWORK_RETRY_INITIAL_WAIT, max=Config.NETWORK_RETRY_MAX_WAIT),
+    retry=(
+        retry_if_exception_type((TranscriptError, ConnectionError))
+        & retry_if_not_exception_type((TranscriptNotAvailableError, VideoNotFoundError))
+    ),
+    reraise=True
+)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _abs_argsort(scores):
+        """Indices that order scores by descending absolute value (single abs pass)."""
+        abs_scores = np.empty_like(scores)
+        for i in range(scores.shape[0]):
+            abs_scores[i] = scores[i] if scores[i] >= 0 else -scores[i]
+        return np.argsort(abs_scores)[::-1]
+else:
+    def _abs_argsort(scores):
+        """Indices that order scores by descending absolute value."""
+        return np.argsort(np.abs(scores))[::-1]
+
 
 @dataclass
 class PipelineResult:
@@ -30,6 +70,51 @@ class PipelineResult:
     youtube_log_df: pd.DataFrame
     results_dir: str
     errors: List[str]
+    save_future: Optional[Future] = None
+    results_format: str = "csv"
+    
+    @property
+    def trend_results_filename(self) -> str:
+        """File name of the saved insights table for this result's format."""
+        return f"trend_results{Config.EXTENSIONS[self.results_format]}"
+    
+    def wait_saved(self):
+        """Block until the result files have been written to disk."""
+        if self.save_future is not None:
+            self.save_future.result()
+
+
+def _log_save_failure(future: Future):
+    """Log a background save that failed, so the error is not lost if nobody waits on it."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Failed to save pipeline results: {future.exception()}")
+
+
+def _save_all(insights_df: pd.DataFrame, youtube_log_df: pd.DataFrame,
+              query_results_df: pd.DataFrame, results_dir: str, errors: List[str],
+              results_format: str = "csv"):
+    """Write all result tables (and the error log, if any) to the results directory."""
+    # Save trend results
+    if results_format == "parquet":
+        trend_results_file = Config.get_file_path(results_dir, "trend_results_parquet")
+        insights_df.to_parquet(trend_results_file, engine="pyarrow", compression="snappy", index=False)
+    else:
+        trend_results_file = Config.get_file_path(results_dir, "trend_results")
+        insights_df.to_csv(trend_results_file, index=False)
+    
+    # Save YouTube log
+    youtube_log_file = Config.get_file_path(results_dir, "youtube_log")
+    youtube_log_df.to_csv(youtube_log_file, index=False)
+    
+    # Save query results table
+    query_results_file = Config.get_file_path(results_dir, "query_results")
+    query_results_df.to_csv(query_results_file, index=False)
+    
+    # Save error log if any errors occurred
+    if errors:
+        error_log_file = os.path.join(results_dir, "errors.txt")
+        with open(error_log_file, "w", encoding="utf-8") as f:
+            f.write("".join(f"{error}\n" for error in errors))
 
 
 class YouTubeTrendsPipeline:
@@ -46,7 +131,9 @@ class YouTubeTrendsPipeline:
         """
         self.start_time = None
         self.errors = []
+        self._errors_q = queue.SimpleQueue()  # Thread-safe error sink
         self.results_base_dir = results_base_dir
+        self._save_pool = ThreadPoolExecutor(max_workers=2)  # Writers for background_save runs
         
         # Initialize all components
         try:
@@ -63,7 +150,9 @@ class YouTubeTrendsPipeline:
         self, 
         user_query: str, 
         max_videos: int = 5,
-        show_progress: bool = True
+        show_progress: bool = True,
+        results_format: str = Config.DEFAULT_RESULTS_FORMAT,
+        background_save: bool = False
     ) -> PipelineResult:
         """
         Execute the complete analysis pipeline.
@@ -72,12 +161,19 @@ class YouTubeTrendsPipeline:
             user_query: User's research query
             max_videos: Maximum number of videos to analyze
             show_progress: Whether to show progress updates
+            results_format: Format for the insights table, "csv" (default) or "parquet"
+            background_save: Write result files on a background thread; call
+                result.wait_saved() (or pipeline.close()) before reading them
             
         Returns:
             PipelineResult with insights table
         """
+        if results_format not in ("parquet", "csv"):
+            raise ValueError(f"Unsupported results_format: {results_format}")
+        
         self.start_time = time.time()
         self.errors = []
+        self._errors_q = queue.SimpleQueue()
         
         if show_progress:
             print(f"🚀 Starting YouTube Trends Analysis")
@@ -110,13 +206,19 @@ class YouTubeTrendsPipeline:
             with open(os.path.join(results_dir, "prompt.txt"), "w", encoding="utf-8") as f:
                 f.write(user_query)
             
+            ai_prompt_content = "\n".join([
+                f"Original User Query: {user_query}",
+                "",
+                "AI Generated Search Queries:",
+                *[f"{i}. {query}" for i, query in enumerate(query_result.queries, 1)],
+                "",
+                f"Date Filter: {query_result.date or 'None'}",
+                "",
+                "AI Reasoning:",
+                query_result.reasoning
+            ])
             with open(os.path.join(results_dir, "ai_prompt.txt"), "w", encoding="utf-8") as f:
-                f.write(f"Original User Query: {user_query}\n\n")
-                f.write(f"AI Generated Search Queries:\n")
-                for i, query in enumerate(query_result.queries, 1):
-                    f.write(f"{i}. {query}\n")
-                f.write(f"\nDate Filter: {query_result.date or 'None'}\n\n")
-                f.write(f"AI Reasoning:\n{query_result.reasoning}")
+                f.write(ai_prompt_content)
             
             # Step 2: Search for videos using multiple queries
             if show_progress:
@@ -150,7 +252,7 @@ class YouTubeTrendsPipeline:
                         print(f"      ✅ {len(query_videos)} videos found")
                     
                 except Exception as e:
-                    self.errors.append(f"Query {i} failed: {str(e)}")
+                    self._errors_q.put(f"Query {i} failed: {str(e)}")
                     query_results_data.append({
                         'query_number': i,
                         'query_text': query,
@@ -203,100 +305,101 @@ class YouTubeTrendsPipeline:
             if show_progress:
                 print(f"\n📝 Processing videos...")
             
-            all_insights = []
+            date_parts, text_parts, score_parts, code_parts = [], [], [], []
+            today_str = datetime.now().strftime("%Y-%m-%d")  # Fallback date for undated videos
+            failed_videos = 0
+            total_insights = 0
             
-            for i, video in enumerate(videos, 1):
+            # A single progress bar replaces per-video print chatter
+            pbar = tqdm(total=len(videos), desc="   🎬 Videos", disable=not show_progress)
+            
+            for video in videos:
                 try:
-                    if show_progress:
-                        print(f"   🎬 Video {i}/{len(videos)}: {video.title[:50]}...")
-                    
                     # Extract transcript
-                    transcript_text = self.transcript_client.get_transcript(video.url)
+                    transcript_text = self._fetch_transcript(video.url)
                     
                     if not transcript_text:
-                        self.errors.append(f"No transcript for: {video.title}")
+                        self._errors_q.put(f"No transcript for: {video.title}")
+                        failed_videos += 1
                         continue
                     
                     # Process insights
-                    video_date = video.publish_time[:10] if video.publish_time else datetime.now().strftime("%Y-%m-%d")
-                    insights = self.processor.process_transcript(transcript_text, video_date)
+                    video_date = video.publish_time[:10] if video.publish_time else today_str
+                    insights = self._extract_insights(transcript_text, video_date)
                     
-                    # Extract all insights into flat list
-                    all_categories = [
-                        ('early_adopter_products', insights.early_adopter_products),
-                        ('emerging_topics', insights.emerging_topics),
-                        ('problem_spaces', insights.problem_spaces),
-                        ('behavioral_patterns', insights.behavioral_patterns),
-                        ('educational_demand', insights.educational_demand)
-                    ]
-                    
-                    for category, category_insights in all_categories:
-                        for insight_text, date, score in category_insights:
-                            all_insights.append({
-                                'date': date,
-                                'category': category,
-                                'information': insight_text,
-                                'score': score
-                            })
-                    
-                    if show_progress:
-                        total = sum(len(insights_list) for _, insights_list in all_categories)
-                        print(f"      ✅ Extracted {total} insights")
+                    # Collect insights as parallel arrays; flattened once after the loop
+                    dates, texts, scores, codes = insights.as_arrays()
+                    date_parts.append(dates)
+                    text_parts.append(texts)
+                    score_parts.append(scores)
+                    code_parts.append(codes)
+                    total_insights += len(scores)
                         
                 except Exception as e:
-                    self.errors.append(f"Failed processing '{video.title}': {str(e)}")
-                    if show_progress:
-                        print(f"      ❌ Failed: {e}")
+                    self._errors_q.put(f"Failed processing '{video.title}': {str(e)}")
+                    failed_videos += 1
                     continue
+                finally:
+                    pbar.set_postfix({'insights': total_insights, 'errors': failed_videos})
+                    pbar.update(1)
+            
+            pbar.close()
             
             # Create DataFrame
-            insights_df = pd.DataFrame(all_insights)
+            if score_parts:
+                insights_df = pd.DataFrame({
+                    'date': np.concatenate(date_parts),
+                    'category': pd.Categorical.from_codes(np.concatenate(code_parts), categories=CATEGORY_NAMES),
+                    'information': np.concatenate(text_parts),
+                    'score': np.concatenate(score_parts)
+                })
+            else:
+                insights_df = pd.DataFrame()
             
             if not insights_df.empty:
                 # Sort by absolute score (most significant trends first)
-                insights_df = insights_df.sort_values('score', key=abs, ascending=False).reset_index(drop=True)
+                order = _abs_argsort(insights_df['score'].to_numpy(dtype=np.float64))
+                insights_df = insights_df.iloc[order].reset_index(drop=True)
             
             processing_time = time.time() - self.start_time
             
+            self._drain_errors()
+            
             # Save all files to results directory
             if show_progress:
                 print(f"\n💾 Saving results...")
             
-            # Save trend results
-            trend_results_file = os.path.join(results_dir, "trend_results.csv")
-            insights_df.to_csv(trend_results_file, index=False)
-            
-            # Save YouTube log
-            youtube_log_file = Config.get_file_path(results_dir, "youtube_log")
-            youtube_log_df.to_csv(youtube_log_file, index=False)
-            
-            # Save query results table
-            query_results_file = Config.get_file_path(results_dir, "query_results")
-            query_results_df.to_csv(query_results_file, index=False)
-            
-            # Save error log if any errors occurred
-            if self.errors:
-                error_log_file = os.path.join(results_dir, "errors.txt")
-                with open(error_log_file, "w", encoding="utf-8") as f:
-                    for error in self.errors:
-                        f.write(f"{error}\n")
+            save_args = (insights_df, youtube_log_df, query_results_df,
+                         results_dir, self.errors.copy(), results_format)
+            if background_save:
+                # Return immediately; failures are logged even if nobody waits on the future
+                save_future = self._save_pool.submit(_save_all, *save_args)
+                save_future.add_done_callback(_log_save_failure)
+            else:
+                _save_all(*save_args)
+                save_future = None
             
             result = PipelineResult(
                 user_query=user_query,
                 optimized_search_query=f"{len(query_result.queries)} queries used",
                 query_reasoning=query_result.reasoning,
-                videos_processed=len(videos) - len([e for e in self.errors if "No transcript" in e or "Failed processing" in e]),
+                videos_processed=len(videos) - failed_videos,
                 total_insights=len(insights_df),
                 processing_time=processing_time,
                 insights_df=insights_df,
                 youtube_log_df=youtube_log_df,
                 results_dir=results_dir,
-                errors=self.errors.copy()
+                errors=self.errors.copy(),
+                save_future=save_future,
+                results_format=results_format
             )
             
             if show_progress:
-                print(f"   ✅ Saved to: {results_dir}/")
-                print(f"      - trend_results.csv ({len(insights_df)} insights)")
+                if background_save:
+                    print(f"   ✅ Saving to: {results_dir}/ (call result.wait_saved() to block until written)")
+                else:
+                    print(f"   ✅ Saved to: {results_dir}/")
+                print(f"      - {result.trend_results_filename} ({len(insights_df)} insights)")
                 print(f"      - youtube_log.csv ({len(youtube_log_df)} videos)")
                 print(f"      - query_results.csv ({len(query_results_df)} queries)")
                 print(f"      - prompt.txt")
@@ -313,9 +416,35 @@ class YouTubeTrendsPipeline:
             
         except Exception as e:
             logger.error(f"Pipeline execution failed: {e}")
-            self.errors.append(f"Pipeline failure: {str(e)}")
+            self._errors_q.put(f"Pipeline failure: {str(e)}")
+            self._drain_errors()
             raise
     
+    def close(self):
+        """Wait for pending background saves and release the writer threads."""
+        self._save_pool.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @_retry_transient
+    def _fetch_transcript(self, video_url: str) -> str:
+        """Fetch a transcript, retrying transient failures."""
+        return self.transcript_client.get_transcript(video_url)
+    
+    def _extract_insights(self, transcript_text: str, video_date: str):
+        """Extract insights from a transcript (transient API errors are retried per chunk by the processor)."""
+        return self.processor.process_transcript(transcript_text, video_date)
+    
+    def _drain_errors(self) -> List[str]:
+        """Move queued error messages into self.errors (in arrival order)."""
+        while not self._errors_q.empty():
+            self.errors.append(self._errors_q.get_nowait())
+        return self.errors
+    
     def display_table(self, result: PipelineResult, limit: int = 20):
         """Display the insights table."""
         if result.insights_df.empty:
@@ -325,12 +454,16 @@ class YouTubeTrendsPipeline:
         print(f"\n📊 INSIGHTS TABLE (Top {min(limit, len(result.insights_df))} entries)")
         print("=" * 100)
         
-        # Display with nice formatting
-        df_display = result.insights_df.head(limit).copy()
-        df_display['information'] = df_display['information'].str[:70] + '...'
-        df_display['score'] = df_display['score'].round(2)
-        
-        print(df_display.to_string(index=True, max_colwidth=70))
+        # Display with nice formatting (formatters avoid copying/mutating the frame)
+        df_display = result.insights_df.head(limit)
+        print(df_display.to_string(
+            index=True,
+            max_colwidth=70,
+            formatters={
+                'information': lambda s: str(s)[:70] + '...',
+                'score': lambda x: f'{x:.2f}'
+            }
+        ))
         
         if len(result.insights_df) > limit:
             print(f"\n... and {len(result.insights_df) - limit} more entries")
@@ -349,7 +482,7 @@ class YouTubeTrendsPipeline:
             'processing_time': f"{result.processing_time:.2f}s",
             'error_count': len(result.errors),
             'files_created': [
-                'trend_results.csv',
+                result.trend_results_filename,
                 'youtube_log.csv',
                 'query_results.csv',
                 'prompt.txt',
@@ -6,17 +6,140 @@ in the vector space without arbitrary thresholds.
 """
 
 import numpy as np
+import pandas as pd
 from typing import List, Dict, Any, Tuple, Optional
-from sklearn.cluster import DBSCAN, OPTICS
+from sklearn.cluster import DBSCAN, OPTICS, cluster_optics_xi
 from sklearn.neighbors import NearestNeighbors
 from sklearn.metrics import silhouette_score
+from sklearn.feature_extraction.text import TfidfVectorizer
 from collections import Counter
+from joblib import Parallel, delayed
+import json
 import logging
+import re
 
+from .config import Config
 from .trends_vector_db import TrendsVectorDB
+from .optional_imports import njit
+
+try:
+    import faiss
+except ImportError:  # Faiss is optional; sklearn is used for k-NN otherwise
+    faiss = None
 
 logger = logging.getLogger(__name__)
 
+# Keyword-frequency theme fallback: common words to skip and the word tokenizer
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+    "is", "are", "was", "were", "be", "been", "have", "has", "had", "do", "does", "did",
+    "will", "would", "could", "should", "may", "might", "can", "cannot", "this", "that",
+    "these", "those", "i", "you", "he", "she", "it", "we", "they", "me", "him", "her", "us",
+    "them", "my", "your", "his", "its", "our", "their"
+})
+_KEYWORD_TOKEN = re.compile(r"[a-z]{3,}")
+
+
+def _cosine_to_euclidean(eps: float) -> float:
+    """Convert a cosine-distance radius to the equivalent euclidean radius on unit vectors."""
+    return float(np.sqrt(2.0 * eps))
+
+
+def _is_good_enough(score: float, n_clusters: int, max_clusters: int) -> bool:
+    """Whether a candidate clustering is good enough to stop the adaptive search."""
+    return (score >= Config.CLUSTERING_EARLY_STOP_SILHOUETTE
+            and Config.CLUSTERING_EARLY_STOP_MIN_CLUSTERS <= n_clusters <= max_clusters)
+
+
+def _silhouette_sample(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fixed random subsample for silhouette scoring and its pairwise distances.
+    
+    Every candidate is scored on the same points from one precomputed matrix, so
+    each silhouette is O(sample^2) lookups instead of recomputing distances.
+    """
+    rng = np.random.RandomState(42)
+    n = embeddings.shape[0]
+    sample = np.sort(rng.choice(n, size=min(Config.CLUSTERING_SILHOUETTE_SAMPLE_SIZE, n), replace=False))
+    return sample, _pairwise_cosine(embeddings[sample])
+
+
+def _fit_and_score(algorithm: str, estimator, X, sample: np.ndarray, sample_distances: np.ndarray,
+                   params: Dict[str, Any], max_clusters: int) -> Optional[Tuple]:
+    """
+    Fit one candidate clustering and score it (runs in a joblib worker).
+    
+    Returns (algorithm, labels, silhouette, params) or None if the candidate is rejected.
+    """
+    try:
+        labels = estimator.fit_predict(X)
+    except (ValueError, RuntimeError):
+        return None
+    return _score_labels(algorithm, labels, sample, sample_distances, params, max_clusters)
+
+
+def _score_labels(algorithm: str, labels: np.ndarray, sample: np.ndarray, sample_distances: np.ndarray,
+                  params: Dict[str, Any], max_clusters: int) -> Optional[Tuple]:
+    """
+    Score one candidate labeling (runs in a joblib worker).
+    
+    Returns (algorithm, labels, silhouette, params) or None if the candidate is rejected.
+    """
+    try:
+        unique_labels = np.unique(labels)  # Sorted, so noise (-1) comes first
+        n_clusters = unique_labels.size - int(unique_labels[0] == -1)
+        
+        # Accept clustering with 2+ clusters and reasonable noise ratio
+        if n_clusters < 2 or n_clusters > max_clusters:
+            return None
+        noise_ratio = (labels == -1).mean()
+        if noise_ratio >= 0.8:  # Less than 80% noise
+            return None
+        
+        # For silhouette score, exclude noise points
+        non_noise_mask = labels != -1
+        # n_clusters >= 2 already guarantees two distinct non-noise labels
+        if np.count_nonzero(non_noise_mask) <= 10:
+            return None
+        sample_labels = labels[sample]
+        keep = sample_labels != -1
+        score = silhouette_score(
+            sample_distances[np.ix_(keep, keep)], sample_labels[keep], metric='precomputed'
+        )
+    except (ValueError, RuntimeError):
+        # Skip if silhouette score calculation fails
+        return None
+    
+    return (algorithm, labels, score, {**params, 'n_clusters': n_clusters, 'noise_ratio': noise_ratio})
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _elbow(sorted_k):
+        """Value at the largest second difference of sorted k-distances (single pass)."""
+        best = -np.inf
+        idx = 1
+        for i in range(1, sorted_k.shape[0] - 1):
+            second = sorted_k[i + 1] - 2.0 * sorted_k[i] + sorted_k[i - 1]
+            if second > best:
+                best = second
+                idx = i
+        return sorted_k[idx]
+else:
+    def _elbow(sorted_k):
+        """Value at the largest second difference of sorted k-distances."""
+        second_derivative = np.diff(sorted_k, 2)
+        return sorted_k[np.argmax(second_derivative) + 1]
+
+
+def _pairwise_cosine(embeddings: np.ndarray) -> np.ndarray:
+    """Dense cosine distance matrix for unit vectors via a single GEMM."""
+    distances = embeddings @ embeddings.T
+    np.subtract(1.0, distances, out=distances)  # In place, so peak memory is one N x N matrix
+    np.clip(distances, 0, None, out=distances)
+    np.fill_diagonal(distances, 0)
+    return distances
+
 
 class SemanticRegionExplorer:
     """Discovers dense semantic regions using density-based clustering algorithms."""
@@ -25,23 +148,36 @@ class SemanticRegionExplorer:
         self.db = vector_db
         self.trends_cache = None
         self.embeddings_cache = None
+        self._kdist_cache = None  # (embeddings, per-column sorted k-NN distances)
+        self._tfidf_cache = None  # (trends, vocabulary, TF-IDF matrix)
+        self._stored_unit_norm = False  # Whether Chroma's stored vectors are already unit length
+        self._last_adaptive_result = None  # (embeddings, result of discover_dense_regions_adaptive)
     
     def _get_all_trends_with_embeddings(self) -> Tuple[List[Dict], np.ndarray]:
         """Get all trends and extract their embeddings from ChromaDB."""
         if self.trends_cache is not None and self.embeddings_cache is not None:
             return self.trends_cache, self.embeddings_cache
         
-        # Get all trends from ChromaDB
-        all_results = self.db.collection.get(
-            include=["documents", "metadatas", "embeddings"]
-        )
+        # Documents and metadata are always read fresh (grades live in metadata);
+        # the embeddings come from the on-disk cache when it matches the collection
+        E = None
+        cached_ids = self._load_embeddings_index()
+        if cached_ids is not None and len(cached_ids) == self.db.collection.count():
+            all_results = self.db.collection.get(include=["documents", "metadatas"])
+            if all_results["ids"] == cached_ids:
+                E = np.load(self.db.db_path / Config.FILES["embeddings_cache"], mmap_mode='r')
+                logger.info(f"Memory-mapped {E.shape[0]} cached embeddings")
+        
+        if E is None:
+            all_results = self.db.collection.get(
+                include=["documents", "metadatas", "embeddings"]
+            )
         
         if not all_results["ids"]:
             raise ValueError("No trends found in database")
         
         # Format trends
         trends = []
-        embeddings = []
         
         for i in range(len(all_results["ids"])):
             trend = {
@@ -50,14 +186,53 @@ class SemanticRegionExplorer:
                 "metadata": all_results["metadatas"][i]
             }
             trends.append(trend)
-            embeddings.append(all_results["embeddings"][i])
+        
+        if E is None:
+            # L2-normalize once so euclidean distance on the cache is a monotonic
+            # transform of cosine distance: ||a - b||^2 = 2 * (1 - cos(a, b))
+            E = np.ascontiguousarray(np.asarray(all_results["embeddings"], dtype=np.float32))
+            norms = np.linalg.norm(E, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            E /= norms
+            
+            # Chroma's HNSW index holds the raw vectors; its distances only match ours if unit length
+            self._stored_unit_norm = bool(np.allclose(norms, 1.0, atol=1e-3))
+            self._save_embeddings_cache(all_results["ids"], E)
         
         self.trends_cache = trends
-        self.embeddings_cache = np.array(embeddings)
+        self.embeddings_cache = E
         
         logger.info(f"Loaded {len(trends)} trends with {self.embeddings_cache.shape[1]}-dim embeddings")
         return trends, self.embeddings_cache
     
+    def _load_embeddings_index(self) -> Optional[List[str]]:
+        """Return the IDs of the on-disk embeddings cache, or None if there is none."""
+        index_file = self.db.db_path / Config.FILES["embeddings_index"]
+        if not index_file.exists() or not (self.db.db_path / Config.FILES["embeddings_cache"]).exists():
+            return None
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self._stored_unit_norm = index["stored_unit_norm"]
+            return index["ids"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable embeddings cache index: {e}")
+            return None
+    
+    def _save_embeddings_cache(self, ids: List[str], embeddings: np.ndarray):
+        """Persist normalized embeddings and their IDs next to the Chroma DB."""
+        index_file = self.db.db_path / Config.FILES["embeddings_index"]
+        try:
+            # The index is removed first and written last so a partial save
+            # is never mistaken for a valid cache
+            if index_file.exists():
+                index_file.unlink()
+            np.save(self.db.db_path / Config.FILES["embeddings_cache"], embeddings)
+            with open(index_file, 'w', encoding='utf-8') as f:
+                json.dump({"ids": ids, "stored_unit_norm": self._stored_unit_norm}, f)
+        except OSError as e:
+            logger.warning(f"Could not write embeddings cache: {e}")
+    
     def discover_dense_regions_dbscan(self, 
                                     min_samples: int = None,
                                     eps: float = None) -> Dict[str, Any]:
@@ -80,8 +255,9 @@ class SemanticRegionExplorer:
         
         logger.info(f"Running DBSCAN with eps={eps:.4f}, min_samples={min_samples}")
         
-        # Apply DBSCAN
-        clustering = DBSCAN(eps=eps, min_samples=min_samples, metric='cosine')
+        # Apply DBSCAN; eps is a cosine distance, the same radius as euclidean sqrt(2 * eps) on unit vectors
+        clustering = DBSCAN(eps=_cosine_to_euclidean(eps), min_samples=min_samples, metric='euclidean',
+                            n_jobs=Config.CLUSTERING_SKLEARN_N_JOBS)
         cluster_labels = clustering.fit_predict(embeddings)
         
         return self._analyze_clusters(trends, embeddings, cluster_labels, "DBSCAN")
@@ -101,8 +277,9 @@ class SemanticRegionExplorer:
         
         logger.info(f"Running OPTICS with min_samples={min_samples}, xi={xi}")
         
-        # Apply OPTICS
-        clustering = OPTICS(min_samples=min_samples, xi=xi, metric='cosine')
+        # Apply OPTICS; xi extraction depends on the distance scale, so this stays in cosine space
+        clustering = OPTICS(min_samples=min_samples, xi=xi, metric='cosine',
+                            n_jobs=Config.CLUSTERING_SKLEARN_N_JOBS)
         cluster_labels = clustering.fit_predict(embeddings)
         
         return self._analyze_clusters(trends, embeddings, cluster_labels, "OPTICS")
@@ -115,73 +292,102 @@ class SemanticRegionExplorer:
         """
         trends, embeddings = self._get_all_trends_with_embeddings()
         
-        algorithms = []
+        max_clusters = len(trends) // 3
+        
+        # Grids are ordered from most-likely-good outward so early stopping fires fast
+        dbscan_min_samples = [5, 3, 8, 12, 20]
+        eps_factors = [1.0, 0.75, 1.25, 0.5]
+        base_eps = {ms: self._estimate_eps(embeddings, ms) for ms in dbscan_min_samples}
+        
+        # One radius-neighbors graph at the largest eps serves every DBSCAN fit;
+        # DBSCAN's precomputed path only keeps edges within its own eps
+        eps_max = _cosine_to_euclidean(max(base_eps.values()) * max(eps_factors))
+        neighbor_graph = NearestNeighbors(radius=eps_max, metric='euclidean',
+                                          n_jobs=Config.CLUSTERING_SKLEARN_N_JOBS).fit(embeddings) \
+            .radius_neighbors_graph(mode='distance')
         
         # Try DBSCAN with wider range of parameters to find more granular clusters
-        for min_samples in [3, 5, 8, 12, 20]:
-            eps = self._estimate_eps(embeddings, min_samples)
-            # Also try more aggressive eps values
-            for eps_factor in [0.5, 0.75, 1.0, 1.25]:
-                adjusted_eps = eps * eps_factor
-                dbscan = DBSCAN(eps=adjusted_eps, min_samples=min_samples, metric='cosine')
-                labels = dbscan.fit_predict(embeddings)
-                
-                unique_labels = set(labels)
-                n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
-                
-                # Accept clustering with 2+ clusters and reasonable noise ratio
-                if n_clusters >= 2 and n_clusters <= len(trends) // 3:
-                    noise_ratio = np.sum(labels == -1) / len(labels)
-                    if noise_ratio < 0.8:  # Less than 80% noise
-                        try:
-                            if n_clusters > 1:
-                                # For silhouette score, exclude noise points
-                                non_noise_mask = labels != -1
-                                if np.sum(non_noise_mask) > 10 and len(set(labels[non_noise_mask])) > 1:
-                                    score = silhouette_score(embeddings[non_noise_mask], labels[non_noise_mask], metric='cosine')
-                                    algorithms.append(('DBSCAN', labels, score, {
-                                        'eps': adjusted_eps, 
-                                        'min_samples': min_samples,
-                                        'n_clusters': n_clusters,
-                                        'noise_ratio': noise_ratio
-                                    }))
-                        except ValueError:
-                            # Skip if silhouette score calculation fails
-                            continue
-        
-        # Try OPTICS with more conservative parameters
-        for min_samples in [3, 5, 8, 12]:
-            for xi in [0.001, 0.01, 0.05, 0.1, 0.2]:
-                try:
-                    optics = OPTICS(min_samples=min_samples, xi=xi, metric='cosine')
-                    labels = optics.fit_predict(embeddings)
-                    
-                    unique_labels = set(labels)
-                    n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
-                    
-                    if n_clusters >= 2 and n_clusters <= len(trends) // 3:
-                        noise_ratio = np.sum(labels == -1) / len(labels)
-                        if noise_ratio < 0.8:
-                            non_noise_mask = labels != -1
-                            if np.sum(non_noise_mask) > 10 and len(set(labels[non_noise_mask])) > 1:
-                                score = silhouette_score(embeddings[non_noise_mask], labels[non_noise_mask], metric='cosine')
-                                algorithms.append(('OPTICS', labels, score, {
-                                    'min_samples': min_samples, 
-                                    'xi': xi,
-                                    'n_clusters': n_clusters,
-                                    'noise_ratio': noise_ratio
-                                }))
-                except (ValueError, RuntimeError):
-                    # Skip if OPTICS fails or silhouette score calculation fails
-                    continue
+        # (and more aggressive eps values); each row of the grid is fitted in parallel,
+        # so these estimators stay single-threaded to avoid oversubscribing cores
+        dbscan_rows = [
+            [
+                ('DBSCAN',
+                 DBSCAN(eps=_cosine_to_euclidean(base_eps[ms] * factor), min_samples=ms, metric='precomputed'),
+                 {'eps': base_eps[ms] * factor, 'min_samples': ms})
+                for factor in eps_factors
+            ]
+            for ms in dbscan_min_samples
+        ]
+        
+        # OPTICS grid; xi only affects cluster extraction from the reachability plot
+        optics_min_samples = [5, 3, 8, 12]
+        optics_xis = [0.05, 0.01, 0.1, 0.001, 0.2]
+        
+        # Distances for the shared silhouette subsample, computed once for all candidates
+        sample, sample_distances = _silhouette_sample(embeddings)
+        
+        algorithms = []
+        
+        def collect(candidates) -> bool:
+            """Keep valid candidates; report whether one is good enough to stop."""
+            valid = [c for c in candidates if c is not None]
+            algorithms.extend(valid)
+            return any(_is_good_enough(c[2], c[3]['n_clusters'], max_clusters) for c in valid)
+        
+        with Parallel(n_jobs=Config.CLUSTERING_ADAPTIVE_N_JOBS, backend='loky') as parallel:
+            # Stop as soon as a good-enough clustering is found
+            stop_early = False
+            for row in dbscan_rows:
+                if collect(parallel(
+                    delayed(_fit_and_score)(name, estimator, neighbor_graph, sample, sample_distances,
+                                            params, max_clusters)
+                    for name, estimator, params in row
+                )):
+                    stop_early = True
+                    break
+            
+            if not stop_early:
+                # OPTICS needs full reachability, so share one dense distance matrix when it
+                # fits the memory budget; otherwise let sklearn compute distances in chunks
+                n = len(embeddings)
+                if n * n * embeddings.dtype.itemsize <= Config.CLUSTERING_DENSE_MATRIX_MAX_BYTES:
+                    optics_input, optics_metric = _pairwise_cosine(embeddings), 'precomputed'
+                else:
+                    logger.info(f"Skipping dense {n}x{n} distance matrix for OPTICS (over memory budget)")
+                    optics_input, optics_metric = embeddings, 'cosine'
+                for ms in optics_min_samples:
+                    # Fit the reachability plot once, then re-extract clusters per xi
+                    try:
+                        optics = OPTICS(min_samples=ms, metric=optics_metric,
+                                        n_jobs=Config.CLUSTERING_SKLEARN_N_JOBS).fit(optics_input)
+                    except (ValueError, RuntimeError):
+                        continue
+                    labels_by_xi = [
+                        cluster_optics_xi(
+                            reachability=optics.reachability_,
+                            predecessor=optics.predecessor_,
+                            ordering=optics.ordering_,
+                            min_samples=ms,
+                            xi=xi
+                        )[0]
+                        for xi in optics_xis
+                    ]
+                    if collect(parallel(
+                        delayed(_score_labels)('OPTICS', labels, sample, sample_distances,
+                                               {'min_samples': ms, 'xi': xi}, max_clusters)
+                        for xi, labels in zip(optics_xis, labels_by_xi)
+                    )):
+                        break
         
         if not algorithms:
             logger.warning("No valid clustering found, falling back to conservative DBSCAN")
             # Fallback: try very conservative DBSCAN
-            eps = self._estimate_eps(embeddings, 3) * 0.3  # Very small eps
-            dbscan = DBSCAN(eps=eps, min_samples=3, metric='cosine')
-            labels = dbscan.fit_predict(embeddings)
-            return self._analyze_clusters(trends, embeddings, labels, "DBSCAN_fallback")
+            eps = _cosine_to_euclidean(base_eps[3] * 0.3)  # Very small eps
+            dbscan = DBSCAN(eps=eps, min_samples=3, metric='precomputed', n_jobs=Config.CLUSTERING_SKLEARN_N_JOBS)
+            labels = dbscan.fit_predict(neighbor_graph)
+            result = self._analyze_clusters(trends, embeddings, labels, "DBSCAN_fallback")
+            self._last_adaptive_result = (embeddings, result)
+            return result
         
         # Pick best algorithm based on silhouette score, but prefer more clusters
         # Sort by silhouette score, then by number of clusters (more is better for exploration)
@@ -200,6 +406,7 @@ class SemanticRegionExplorer:
             "alternative_algorithms": algorithms[:3]  # Show top 3 alternatives
         }
         
+        self._last_adaptive_result = (embeddings, result)
         return result
     
     def _estimate_eps(self, embeddings: np.ndarray, min_samples: int) -> float:
@@ -207,92 +414,153 @@ class SemanticRegionExplorer:
         Estimate optimal eps parameter using k-distance graph method.
         
         This is the proper way to determine eps for DBSCAN, not arbitrary thresholds.
+        The elbow is found on cosine k-distances and the returned eps is a cosine
+        distance; the nonlinear sqrt to euclidean would move the knee.
         """
-        # Find k-nearest neighbors (k = min_samples)
-        neighbors = NearestNeighbors(n_neighbors=min_samples, metric='cosine')
-        neighbors_fit = neighbors.fit(embeddings)
-        distances, _ = neighbors_fit.kneighbors(embeddings)
-        
-        # Sort k-distances (distance to kth nearest neighbor)
-        k_distances = np.sort(distances[:, -1])
+        # Sorted k-distances (distance to kth nearest neighbor, k = min_samples), converted
+        # from euclidean on unit vectors to cosine: d_cos = d_euc^2 / 2 (monotonic, so still sorted)
+        k_distances = np.square(self._sorted_kdistances(embeddings, min_samples)[:, min_samples - 1],
+                                dtype=np.float64) / 2.0
         
         # Find elbow point (steepest increase)
         # Use second derivative to find inflection point
         if len(k_distances) > 2:
-            second_derivative = np.diff(k_distances, 2)
-            elbow_idx = np.argmax(second_derivative) + 1
-            optimal_eps = k_distances[elbow_idx]
+            optimal_eps = float(_elbow(np.ascontiguousarray(k_distances)))
         else:
             optimal_eps = np.mean(k_distances)
         
         return optimal_eps
     
+    def _sorted_kdistances(self, embeddings: np.ndarray, min_neighbors: int) -> np.ndarray:
+        """
+        k-NN distances for k = 1..max(CLUSTERING_KDIST_MAX_NEIGHBORS, min_neighbors), each column sorted ascending.
+        
+        Fitted once per embeddings array and reused for every min_samples value.
+        """
+        cached = self._kdist_cache
+        if cached is not None and cached[0] is embeddings and cached[1].shape[1] >= min_neighbors:
+            return cached[1]
+        
+        n_neighbors = min(max(Config.CLUSTERING_KDIST_MAX_NEIGHBORS, min_neighbors), len(embeddings))
+        # Prefer ChromaDB's existing HNSW index; fall back to an exact search
+        distances = self._hnsw_kdistances(embeddings, n_neighbors)
+        if distances is None:
+            distances = self._exact_kdistances(embeddings, n_neighbors)
+        sorted_distances = np.sort(distances, axis=0)
+        
+        self._kdist_cache = (embeddings, sorted_distances)
+        return sorted_distances
+    
+    def _exact_kdistances(self, embeddings: np.ndarray, n_neighbors: int) -> np.ndarray:
+        """Exact k-NN euclidean distances, via Faiss when available."""
+        if faiss is not None:
+            # SIMD inner-product search; on unit vectors ||a - b|| = sqrt(2 - 2 a.b)
+            index = faiss.IndexFlatIP(embeddings.shape[1])
+            index.add(embeddings)
+            similarities, _ = index.search(embeddings, n_neighbors)
+            return np.sqrt(np.clip(2.0 - 2.0 * similarities, 0, None))
+        
+        neighbors = NearestNeighbors(n_neighbors=n_neighbors, metric='euclidean',
+                                     n_jobs=Config.CLUSTERING_SKLEARN_N_JOBS)
+        distances, _ = neighbors.fit(embeddings).kneighbors(embeddings)
+        return distances
+    
+    def _hnsw_kdistances(self, embeddings: np.ndarray, n_neighbors: int) -> Optional[np.ndarray]:
+        """
+        k-NN euclidean distances (unit vectors) from ChromaDB's HNSW index.
+        
+        Returns None when the index can't stand in for the cached embeddings,
+        so the caller falls back to an exact search.
+        """
+        if embeddings is not self.embeddings_cache or not self._stored_unit_norm:
+            return None
+        
+        space = (self.db.collection.metadata or {}).get("hnsw:space", "l2")
+        try:
+            rows = []
+            batch_size = Config.CLUSTERING_HNSW_QUERY_BATCH_SIZE
+            for start in range(0, len(embeddings), batch_size):
+                batch = embeddings[start:start + batch_size]
+                result = self.db.collection.query(
+                    query_embeddings=batch.tolist(),
+                    n_results=n_neighbors,
+                    include=["distances"]
+                )
+                rows.extend(result["distances"])
+            raw = np.asarray(rows, dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"HNSW k-NN query failed, using exact search: {e}")
+            return None
+        
+        if raw.shape != (len(embeddings), n_neighbors):
+            return None
+        
+        # Chroma reports squared L2 for "l2" and 1 - similarity for "cosine"/"ip"
+        if space == "l2":
+            return np.sqrt(np.clip(raw, 0, None))
+        return np.sqrt(np.clip(2.0 * raw, 0, None))
+    
     def _analyze_clusters(self, trends: List[Dict], embeddings: np.ndarray, 
                          cluster_labels: np.ndarray, algorithm: str) -> Dict[str, Any]:
         """Analyze discovered clusters and extract semantic regions."""
         
-        unique_labels = set(cluster_labels)
-        noise_points = np.sum(cluster_labels == -1)
-        n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
+        unique_labels = np.unique(cluster_labels)  # Sorted, so noise (-1) comes first
+        noise_points = np.count_nonzero(cluster_labels == -1)
+        n_clusters = unique_labels.size - int(unique_labels[0] == -1)
         
         logger.info(f"Found {n_clusters} clusters, {noise_points} noise points")
         
+        # Per-cluster category, score and date statistics in one grouped pass
+        metadata = pd.DataFrame([t["metadata"] for t in trends], columns=["category", "score", "date"])
+        metadata["label"] = cluster_labels
+        metadata = metadata[metadata["label"] != -1]
+        grouped = metadata.groupby("label")
+        score_stats = grouped["score"].agg(["mean", "min", "max"])
+        score_stats["std"] = grouped["score"].std(ddof=0)  # Population std, as np.std
+        date_stats = grouped["date"].agg(["min", "max", "nunique"])
+        category_counts = metadata.groupby(["label", "category"]).size()
+        
         regions = []
-        cluster_stats = {}
         
-        for label in unique_labels:
-            if label == -1:  # Skip noise points
-                continue
-            
+        for label in unique_labels[unique_labels != -1]:  # Skip noise points
             # Get trends in this cluster
             cluster_mask = cluster_labels == label
-            cluster_trends = [trends[i] for i in range(len(trends)) if cluster_mask[i]]
+            cluster_indices = np.flatnonzero(cluster_mask)
             cluster_embeddings = embeddings[cluster_mask]
             
-            # Calculate cluster properties
-            centroid = np.mean(cluster_embeddings, axis=0)
-            
-            # Calculate density metrics
-            pairwise_distances = []
-            for i in range(len(cluster_embeddings)):
-                for j in range(i+1, len(cluster_embeddings)):
-                    # Use cosine similarity (1 - cosine distance)
-                    similarity = 1 - np.dot(cluster_embeddings[i], cluster_embeddings[j]) / (
-                        np.linalg.norm(cluster_embeddings[i]) * np.linalg.norm(cluster_embeddings[j])
-                    )
-                    pairwise_distances.append(similarity)
-            
-            avg_internal_similarity = 1 - np.mean(pairwise_distances) if pairwise_distances else 0
+            # Calculate density metrics (embeddings are unit vectors, so dot = cosine)
+            n = len(cluster_embeddings)
+            if n > 1:
+                sims = cluster_embeddings @ cluster_embeddings.T
+                # Mean of off-diagonal entries, without materializing index arrays
+                avg_internal_similarity = float((sims.sum() - np.trace(sims)) / (n * (n - 1)))
+            else:
+                avg_internal_similarity = 0
             
             # Extract semantic themes
-            themes = self._extract_cluster_themes(cluster_trends)
-            
-            # Category distribution
-            categories = [t["metadata"]["category"] for t in cluster_trends]
-            category_dist = dict(Counter(categories))
-            
-            # Score statistics
-            scores = [t["metadata"]["score"] for t in cluster_trends]
+            themes = self._extract_cluster_themes(trends, cluster_indices)
             
-            # Date distribution
-            dates = [t["metadata"]["date"] for t in cluster_trends]
+            scores = score_stats.loc[label]
+            dates = date_stats.loc[label]
             
             region = {
                 "cluster_id": int(label),
-                "size": len(cluster_trends),
+                "size": int(cluster_indices.size),
                 "density_score": float(avg_internal_similarity),
                 "themes": themes,
-                "category_distribution": category_dist,
+                "category_distribution": {
+                    category: int(count) for category, count in category_counts.loc[label].items()
+                },
                 "score_stats": {
-                    "mean": float(np.mean(scores)),
-                    "std": float(np.std(scores)),
-                    "min": float(np.min(scores)),
-                    "max": float(np.max(scores))
+                    "mean": float(scores["mean"]),
+                    "std": float(scores["std"]),
+                    "min": float(scores["min"]),
+                    "max": float(scores["max"])
                 },
                 "date_range": {
-                    "earliest": min(dates) if dates else None,
-                    "latest": max(dates) if dates else None,
-                    "unique_dates": len(set(dates))
+                    "earliest": dates["min"],
+                    "latest": dates["max"],
+                    "unique_dates": int(dates["nunique"])
                 },
                 "sample_trends": [
                     {
@@ -300,18 +568,15 @@ class SemanticRegionExplorer:
                         "score": t["metadata"]["score"],
                         "category": t["metadata"]["category"]
                     }
-                    for t in cluster_trends[:3]  # Top 3 as samples
+                    for t in (trends[i] for i in cluster_indices[:3])  # Top 3 as samples
                 ]
             }
             
             regions.append(region)
-            cluster_stats[label] = {
-                "centroid": centroid,
-                "trends": cluster_trends
-            }
         
-        # Sort regions by density score (most dense first)
-        regions.sort(key=lambda x: x["density_score"], reverse=True)
+        # Sort regions by density score (most dense first; stable, so ties keep label order)
+        density_scores = np.fromiter((r["density_score"] for r in regions), dtype=np.float64, count=len(regions))
+        regions = [regions[i] for i in np.argsort(-density_scores, kind='stable')]
         
         return {
             "algorithm": algorithm,
@@ -323,21 +588,35 @@ class SemanticRegionExplorer:
             "embedding_dimension": int(embeddings.shape[1])
         }
     
-    def _extract_cluster_themes(self, cluster_trends: List[Dict]) -> List[str]:
+    def _extract_cluster_themes(self, trends: List[Dict], indices: np.ndarray) -> List[str]:
+        """Extract semantic themes from a cluster as its highest-weighted TF-IDF terms."""
+        if self._tfidf_cache is None or self._tfidf_cache[0] is not trends:
+            vectorizer = TfidfVectorizer(stop_words='english', token_pattern=r'[A-Za-z]{3,}', max_features=20000)
+            try:
+                matrix = vectorizer.fit_transform([t["text"] for t in trends])
+            except ValueError:
+                # Empty vocabulary (e.g. only stop words); use keyword frequency instead
+                return self._keyword_themes([trends[i] for i in indices])
+            self._tfidf_cache = (trends, vectorizer.get_feature_names_out(), matrix)
+        
+        _, vocabulary, matrix = self._tfidf_cache
+        
+        # Sum term weights over the cluster's rows (sparse reduction) and take the top 5
+        row_sum = np.asarray(matrix[indices].sum(axis=0)).ravel()
+        k = min(5, row_sum.size)
+        top = np.argpartition(-row_sum, k - 1)[:k]
+        top = top[np.argsort(-row_sum[top])]
+        
+        return [str(vocabulary[i]) for i in top if row_sum[i] > 0]
+    
+    def _keyword_themes(self, cluster_trends: List[Dict]) -> List[str]:
         """Extract semantic themes from a cluster using simple keyword frequency."""
         # Combine all text
         all_text = " ".join([t["text"].lower() for t in cluster_trends])
         
-        # Simple keyword extraction (could be enhanced with TF-IDF or more sophisticated methods)
-        words = all_text.split()
-        
-        # Filter out common words and short words
-        stop_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "is", "are", "was", "were", "be", "been", "have", "has", "had", "do", "does", "did", "will", "would", "could", "should", "may", "might", "can", "cannot", "this", "that", "these", "those", "i", "you", "he", "she", "it", "we", "they", "me", "him", "her", "us", "them", "my", "your", "his", "its", "our", "their"}
-        
-        filtered_words = [w for w in words if len(w) > 2 and w not in stop_words and w.isalpha()]
-        
-        # Get most common words
-        word_counts = Counter(filtered_words)
+        # Simple keyword extraction (fallback when TF-IDF has no usable vocabulary);
+        # the tokenizer only yields alphabetic words of 3+ letters
+        word_counts = Counter(w for w in _KEYWORD_TOKEN.findall(all_text) if w not in _STOP_WORDS)
         top_themes = [word for word, count in word_counts.most_common(5)]
         
         return top_themes
@@ -350,8 +629,11 @@ class SemanticRegionExplorer:
         """
         trends, embeddings = self._get_all_trends_with_embeddings()
         
-        # Re-run clustering to get cluster assignments
-        result = self.discover_dense_regions_adaptive()
+        # Reuse the last adaptive clustering of these embeddings if there is one
+        if self._last_adaptive_result is not None and self._last_adaptive_result[0] is embeddings:
+            result = self._last_adaptive_result[1]
+        else:
+            result = self.discover_dense_regions_adaptive()
         
         # Find trends in the specified region
         target_region = None
@@ -4,7 +4,9 @@ Simple Vector Store using ChromaDB's built-in embeddings (no OpenAI required)
 
 import os
 import json
+import hashlib
 import pandas as pd
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import asdict
@@ -23,6 +25,7 @@ class SimpleVectorStore:
         try:
             import chromadb
             from chromadb.config import Settings
+            from chromadb.utils import embedding_functions
             self._chromadb = chromadb
         except ImportError:
             raise Exception("chromadb package required: pip install chromadb")
@@ -39,17 +42,30 @@ class SimpleVectorStore:
             settings=Settings(anonymized_telemetry=False)
         )
         
-        # Get or create collection (ChromaDB will use default embeddings)
+        # ChromaDB's default embeddings, held here so repeated query strings
+        # are embedded once and reused
+        self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        self._embed_query = lru_cache(maxsize=Config.VECTOR_DB_QUERY_CACHE_SIZE)(self._compute_query_embedding)
+        
+        # Get or create collection
         try:
-            self.collection = self.client.get_collection(name=self.collection_name)
+            self.collection = self.client.get_collection(
+                name=self.collection_name,
+                embedding_function=self._embedding_function
+            )
             logger.info(f"Connected to existing collection: {self.collection_name}")
         except:
             self.collection = self.client.create_collection(
                 name=self.collection_name,
+                embedding_function=self._embedding_function,
                 metadata={"description": "YouTube trends with automatic embeddings"}
             )
             logger.info(f"Created new collection: {self.collection_name}")
     
+    def _compute_query_embedding(self, query: str):
+        """Embed a single query string."""
+        return self._embedding_function([query])[0]
+    
     def add_trends_from_runs(self, run_ids: List[str] = None) -> Dict[str, Any]:
         """Add trends from YouTube analysis runs."""
         parser = TrendResultsParser()
@@ -78,13 +94,24 @@ class SimpleVectorStore:
         if not all_trends:
             return {"success": False, "error": "No trends found"}
         
+        # Deduplicate identical texts so each is embedded once; the content
+        # hash doubles as a stable ID
+        unique_trends = {}
+        for trend in all_trends:
+            text_hash = hashlib.blake2b(trend.text.encode(), digest_size=16).hexdigest()
+            entry = unique_trends.get(text_hash)
+            if entry is None:
+                unique_trends[text_hash] = (trend, [trend.run_id])
+            elif trend.run_id not in entry[1]:
+                entry[1].append(trend.run_id)
+        
         # Add to ChromaDB
         ids = []
         documents = []
         metadatas = []
         
-        for i, trend in enumerate(all_trends):
-            ids.append(f"trend_{i}")
+        for text_hash, (trend, trend_run_ids) in unique_trends.items():
+            ids.append(text_hash)
             documents.append(trend.text)
             metadatas.append({
                 "category": trend.category,
@@ -92,18 +119,33 @@ class SimpleVectorStore:
                 "video_title": trend.video_title,
                 "channel": trend.channel,
                 "run_id": trend.run_id,
+                "run_ids": ",".join(trend_run_ids),  # Chroma metadata must be scalar
+                "run_count": len(trend_run_ids),
                 "user_query": trend.user_query
             })
         
-        self.collection.add(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas
-        )
+        # Add in batches so Chroma embeds and indexes a bounded chunk at a time
+        batch_size = Config.VECTOR_DB_ADD_BATCH_SIZE
+        trends_added = 0
+        failed_batches = 0
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            try:
+                self.collection.add(
+                    ids=ids[start:end],
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end]
+                )
+                trends_added += len(ids[start:end])
+            except Exception as e:
+                failed_batches += 1
+                logger.warning(f"Failed to add trends {start}-{min(end, len(ids))}: {e}")
         
         return {
-            "success": True,
-            "trends_added": len(all_trends),
+            "success": trends_added > 0,
+            "trends_added": trends_added,
+            "duplicates_skipped": len(all_trends) - len(ids),
+            "failed_batches": failed_batches,
             "runs_processed": len(run_ids)
         }
     
@@ -114,7 +156,7 @@ class SimpleVectorStore:
             where_clause = {"category": category}
         
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=[self._embed_query(query)],
             n_results=top_k,
             where=where_clause,
             include=["metadatas", "documents", "distances"]
@@ -166,6 +208,7 @@ class SimpleVectorStore:
             self.client.delete_collection(name=self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
+                embedding_function=self._embedding_function,
                 metadata={"description": "YouTube trends with automatic embeddings"}
             )
             return True
@@ -1,8 +1,13 @@
 """YouTube transcript retrieval module."""
 
+import asyncio
 import logging
-from typing import List, Dict, Optional
-from urllib.parse import urlparse, parse_qs
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, Dict, Optional, Union
+from urllib.parse import urlparse, unquote_plus
 
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 
@@ -26,48 +31,105 @@ class TranscriptNotAvailableError(TranscriptError):
     pass
 
 
+def _host_pattern(hosts: List[str]) -> str:
+    """Regex alternation matching any of the given hostnames exactly."""
+    return "(?:" + "|".join(re.escape(host) for host in hosts) + ")"
+
+
+# Fast path for canonical watch, embed and short URLs carrying a standard-length ID;
+# anything else falls back to urlparse. Watch URLs only take the fast path when the ID
+# is the first v= value, as parse_qs would pick it: skipped parameters may not be v=
+# and may not contain '%', which could hide an encoded 'v' key
+_ID = rf"([A-Za-z0-9_-]{{{Config.YOUTUBE_VIDEO_ID_LENGTH}}})"
+
+# A bare video ID; YouTube IDs use the URL-safe base64 alphabet, including '-' and '_'
+_VIDEO_ID_RE = re.compile(rf"[A-Za-z0-9_-]{{{Config.YOUTUBE_VIDEO_ID_LENGTH}}}")
+_YT_ID_RE = re.compile(
+    rf"^https?://(?:"
+    rf"{_host_pattern(Config.YOUTUBE_DOMAINS)}{re.escape(Config.YOUTUBE_WATCH_PATH)}\?(?:(?!v=)[^&#%]*&)*v={_ID}(?=[&#]|$)"
+    rf"|{_host_pattern(Config.YOUTUBE_DOMAINS)}{re.escape(Config.YOUTUBE_EMBED_PATH)}{_ID}(?=[?#]|$)"
+    rf"|{_host_pattern(Config.YOUTUBE_SHORT_DOMAINS)}/{_ID}(?=[?#]|$)"
+    rf")"
+)
+
+
+def _query_param(query: str, name: str) -> Optional[str]:
+    """First non-empty value of a query-string parameter, without parsing the rest."""
+    for pair in query.split('&'):
+        key, _, value = pair.partition('=')
+        if value and unquote_plus(key) == name:
+            return unquote_plus(value)
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _extract_video_id_cached(url: str) -> Optional[str]:
+    """Extract a video ID from a URL or bare ID (memoized; see YouTubeTranscriptClient.extract_video_id)."""
+    if not url:
+        return None
+        
+    # If it's already a video ID (Config.YOUTUBE_VIDEO_ID_LENGTH URL-safe characters)
+    if _VIDEO_ID_RE.fullmatch(url):
+        return url
+    
+    match = _YT_ID_RE.match(url)
+    if match:
+        return match.group(match.lastindex)
+        
+    try:
+        parsed_url = urlparse(url)
+        
+        # Standard YouTube URLs
+        if parsed_url.hostname in Config.YOUTUBE_DOMAINS:
+            if parsed_url.path == Config.YOUTUBE_WATCH_PATH:
+                return _query_param(parsed_url.query, 'v')
+            elif parsed_url.path.startswith(Config.YOUTUBE_EMBED_PATH):
+                return parsed_url.path.split(Config.YOUTUBE_EMBED_PATH)[1].split('?')[0]
+                
+        # Shortened YouTube URLs
+        elif parsed_url.hostname in Config.YOUTUBE_SHORT_DOMAINS:
+            return parsed_url.path.lstrip('/')
+            
+    except Exception as e:
+        logger.warning(f"Failed to parse URL {url}: {e}")
+        
+    return None
+
+
 class YouTubeTranscriptClient:
     """Client for retrieving YouTube video transcripts."""
     
     def __init__(self):
-        """Initialize the transcript client."""
-        pass
+        """
+        Initialize the transcript client.
+        
+        Keep the client long-lived: each thread reuses one YouTubeTranscriptApi,
+        and with it one HTTP session's keep-alive connection pool.
+        """
+        self._local = threading.local()
+    
+    @property
+    def _api(self) -> YouTubeTranscriptApi:
+        """This thread's YouTubeTranscriptApi (its HTTP session is not shared across threads)."""
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = self._local.api = YouTubeTranscriptApi()
+        return api
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """
         Extract video ID from various YouTube URL formats.
         
+        Results are memoized across clients; see
+        _extract_video_id_cached.cache_info() for hit rates.
+        
         Args:
             url: YouTube URL or video ID
             
         Returns:
             Video ID if valid, None otherwise
         """
-        if not url:
-            return None
-            
-        # If it's already a video ID (Config.YOUTUBE_VIDEO_ID_LENGTH characters, alphanumeric)
-        if len(url) == Config.YOUTUBE_VIDEO_ID_LENGTH and url.isalnum():
-            return url
-            
-        try:
-            parsed_url = urlparse(url)
-            
-            # Standard YouTube URLs
-            if parsed_url.hostname in Config.YOUTUBE_DOMAINS:
-                if parsed_url.path == Config.YOUTUBE_WATCH_PATH:
-                    return parse_qs(parsed_url.query).get('v', [None])[0]
-                elif parsed_url.path.startswith(Config.YOUTUBE_EMBED_PATH):
-                    return parsed_url.path.split(Config.YOUTUBE_EMBED_PATH)[1].split('?')[0]
-                    
-            # Shortened YouTube URLs
-            elif parsed_url.hostname in Config.YOUTUBE_SHORT_DOMAINS:
-                return parsed_url.path.lstrip('/')
-                
-        except Exception as e:
-            logger.warning(f"Failed to parse URL {url}: {e}")
-            
-        return None
+        return _extract_video_id_cached(url)
     
     def get_transcript(self, video_url: str, languages: Optional[List[str]] = None) -> str:
         """
@@ -92,11 +154,10 @@ class YouTubeTranscriptClient:
         logger.info(f"Retrieving transcript for video ID: {video_id}")
         
         try:
-            api = YouTubeTranscriptApi()
             if languages:
-                transcript = api.fetch(video_id, languages=languages)
+                transcript = self._api.fetch(video_id, languages=languages)
             else:
-                transcript = api.fetch(video_id)
+                transcript = self._api.fetch(video_id)
             transcript_list = [snippet.text for snippet in transcript]
             combined_transcript = " ".join(transcript_list)
                 
@@ -139,8 +200,7 @@ class YouTubeTranscriptClient:
         logger.info(f"Getting available languages for video ID: {video_id}")
         
         try:
-            api = YouTubeTranscriptApi()
-            transcript_list = api.list(video_id)
+            transcript_list = self._api.list(video_id)
             languages = []
             
             for transcript in transcript_list:
@@ -170,4 +230,87 @@ class YouTubeTranscriptClient:
         try:
             return self.get_available_languages(video_id)
         except Exception:
-            return []
\ No newline at end of file
+            return []
+    
+    def get_transcripts(self, video_urls: List[str], languages: Optional[List[str]] = None,
+                        max_workers: int = Config.TRANSCRIPT_FETCH_CONCURRENCY) -> Dict[str, Union[str, Exception]]:
+        """
+        Retrieve transcripts for many videos on a thread pool.
+        
+        For synchronous callers; the underlying HTTP client releases the GIL
+        while waiting on sockets, so downloads overlap.
+        
+        Args:
+            video_urls: YouTube video URLs or IDs
+            languages: List of preferred language codes (e.g., ['en', 'es'])
+            max_workers: Maximum number of downloads in flight at once
+            
+        Returns:
+            Mapping of each URL to its transcript text, or to the exception raised for it
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.get_transcript, url, languages): url for url in video_urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    results[url] = e
+        return results
+    
+    async def aget_transcript(self, video_url: str, languages: Optional[List[str]] = None) -> str:
+        """
+        Retrieve a transcript without blocking the event loop.
+        
+        youtube_transcript_api is synchronous, so the request runs in a worker
+        thread (socket I/O releases the GIL).
+        
+        Args:
+            video_url: YouTube video URL or ID
+            languages: List of preferred language codes (e.g., ['en', 'es'])
+            
+        Returns:
+            Combined transcript text as a single string
+            
+        Raises:
+            Same exceptions as get_transcript
+        """
+        return await asyncio.to_thread(self.get_transcript, video_url, languages)
+    
+    async def aget_many(self, video_urls: List[str], languages: Optional[List[str]] = None,
+                        concurrency: int = Config.TRANSCRIPT_FETCH_CONCURRENCY) -> Dict[str, Union[str, Exception]]:
+        """
+        Retrieve transcripts for many videos concurrently.
+        
+        Args:
+            video_urls: YouTube video URLs or IDs
+            languages: List of preferred language codes (e.g., ['en', 'es'])
+            concurrency: Maximum number of downloads in flight at once
+            
+        Returns:
+            Mapping of each URL to its transcript text, or to the exception raised for it
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(video_url: str) -> str:
+            async with semaphore:
+                return await self.aget_transcript(video_url, languages)
+        
+        results = await asyncio.gather(*(fetch(url) for url in video_urls), return_exceptions=True)
+        return dict(zip(video_urls, results))
+    
+    def get_many(self, video_urls: List[str], languages: Optional[List[str]] = None,
+                 concurrency: int = Config.TRANSCRIPT_FETCH_CONCURRENCY) -> Dict[str, Union[str, Exception]]:
+        """
+        Synchronous wrapper around aget_many; must not be called from a running event loop.
+        
+        Args:
+            video_urls: YouTube video URLs or IDs
+            languages: List of preferred language codes (e.g., ['en', 'es'])
+            concurrency: Maximum number of downloads in flight at once
+            
+        Returns:
+            Mapping of each URL to its transcript text, or to the exception raised for it
+        """
+        return asyncio.run(self.aget_many(video_urls, languages, concurrency))
@@ -1,15 +1,49 @@
 """Transcript processing module using DSPy for structured insight extraction."""
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-from typing import List, Tuple, Dict
-from dataclasses import dataclass
+import threading
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from pathlib import Path
+from typing import List, Tuple, Dict, Optional, Iterator
+from dataclasses import dataclass, asdict
 from datetime import datetime
 
+import numpy as np
+
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Sentence delimiters as bytes; they are ASCII, so they never occur inside a
+# multi-byte UTF-8 sequence and byte offsets after them are safe split points
+_DELIMS_U8 = np.frombuffer(Config.SENTENCE_DELIMITERS.encode('ascii'), dtype=np.uint8)
+
+# Above this many insights, sort by |score| with NumPy instead of a Python key function
+_ARGSORT_MIN_INSIGHTS = 512
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; token counts are estimated from length otherwise
+    tiktoken = None
+
+
+@lru_cache(maxsize=1)
+def _token_encoder():
+    """Shared tiktoken encoding (loading it is expensive)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_tokens(text: str, exact: bool = False) -> int:
+    """Token count of text: ~4 characters per token, or tiktoken's count when exact."""
+    if exact and tiktoken is not None:
+        return len(_token_encoder().encode(text))
+    return max(1, len(text) >> 2)
+
 # Type definitions
 LLMInsight = Tuple[str, float]  # (insight_text, t_t_score -1.0 to 1.0)
 InsightTuple = Tuple[str, str, float]  # (insight_text, transcript_date, t_t_score)
@@ -34,16 +68,32 @@ class TranscriptProcessingError(Exception):
 class TranscriptChunker:
     """Smart transcript chunking system that preserves context."""
     
-    def __init__(self, max_chunk_size: int = Config.TRANSCRIPT_MAX_CHUNK_SIZE, overlap_size: int = Config.TRANSCRIPT_OVERLAP_SIZE):
+    def __init__(self, max_chunk_size: int = Config.TRANSCRIPT_MAX_CHUNK_SIZE, overlap_size: int = Config.TRANSCRIPT_OVERLAP_SIZE,
+                 max_chunk_tokens: Optional[int] = None, exact_tokens: bool = False):
         """
         Initialize chunker with size parameters.
         
         Args:
-            max_chunk_size: Maximum characters per chunk
+            max_chunk_size: Maximum characters per chunk (used when max_chunk_tokens is None)
             overlap_size: Characters to overlap between chunks
+            max_chunk_tokens: Maximum tokens per chunk; chunks are sized by tokens when set
+            exact_tokens: Count tokens with tiktoken (if installed) instead of estimating
         """
         self.max_chunk_size = max_chunk_size
         self.overlap_size = overlap_size
+        self.max_chunk_tokens = max_chunk_tokens
+        self.exact_tokens = exact_tokens
+    
+    @property
+    def chunk_budget(self) -> int:
+        """Maximum chunk size, in the unit measured by _measure."""
+        return self.max_chunk_size if self.max_chunk_tokens is None else self.max_chunk_tokens
+    
+    def _measure(self, text: str) -> int:
+        """Size of text in characters, or in tokens when chunking by tokens."""
+        if self.max_chunk_tokens is None:
+            return len(text)
+        return _count_tokens(text, self.exact_tokens)
     
     def chunk_transcript(self, transcript: str) -> List[str]:
         """
@@ -55,71 +105,208 @@ class TranscriptChunker:
         Returns:
             List of transcript chunks with preserved context
         """
-        if len(transcript) <= self.max_chunk_size:
-            return [transcript]
+        chunks = list(self.iter_chunks(transcript))
+        logger.info(f"Split transcript into {len(chunks)} chunks")
+        return chunks
+    
+    def iter_chunks(self, transcript: str) -> Iterator[str]:
+        """
+        Lazily yield overlapping chunks at sentence boundaries.
         
-        # Split into sentences while preserving punctuation
-        sentences = self._split_sentences(transcript)
-        chunks = []
-        current_chunk = ""
+        Args:
+            transcript: Full transcript text
+            
+        Yields:
+            Transcript chunks with preserved context, in order
+        """
+        budget = self.chunk_budget
+        if self._measure(transcript) <= budget:
+            yield transcript
+            return
+        
+        # Sentences of the current chunk, joined only when the chunk is emitted
+        current_parts = []
+        current_size = 0
         overlap_buffer = ""
+        # Last full chunk, held back one step in case the tail is merged into it
+        pending = None
         
-        for sentence in sentences:
+        # Split into sentences while preserving punctuation
+        for sentence in self._iter_sentences(transcript):
+            sentence_size = self._measure(sentence)
             # Check if adding this sentence would exceed limit
-            if len(current_chunk + sentence) > self.max_chunk_size and current_chunk:
-                # Add current chunk
-                chunks.append(overlap_buffer + current_chunk)
+            if current_size + sentence_size > budget and current_parts:
+                # Emit previous chunk and hold back the current one
+                current_chunk = "".join(current_parts)
+                if pending is not None:
+                    yield pending
+                pending = overlap_buffer + current_chunk
                 
                 # Prepare overlap for next chunk
                 overlap_buffer = self._create_overlap(current_chunk)
-                current_chunk = sentence
+                current_parts = [sentence]
+                current_size = sentence_size
             else:
-                current_chunk += sentence
+                current_parts.append(sentence)
+                current_size += sentence_size
         
-        # Add final chunk
-        if current_chunk:
-            chunks.append(overlap_buffer + current_chunk)
+        # Greedy packing is already minimal in chunk count, except that a short
+        # final tail would cost a whole extra round of extraction calls; fold it
+        # into the previous chunk instead
+        tail = "".join(current_parts)
+        if pending is not None and current_size < Config.TRANSCRIPT_MIN_TAIL_FRACTION * budget:
+            yield pending + tail
+            return
         
-        logger.info(f"Split transcript into {len(chunks)} chunks")
-        return chunks
+        # Emit final chunks
+        if pending is not None:
+            yield pending
+        if current_parts:
+            yield overlap_buffer + tail
     
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences while preserving context."""
-        # Simple sentence splitting - could be enhanced with NLTK
-        sentences = []
-        current = ""
+        return list(self._iter_sentences(text))
+    
+    def _iter_sentences(self, text: str) -> Iterator[str]:
+        """Lazily yield sentences while preserving context."""
+        # Find every delimiter in one vectorized scan over the UTF-8 bytes
+        data = text.encode('utf-8')
+        ends = np.flatnonzero(np.isin(np.frombuffer(data, dtype=np.uint8), _DELIMS_U8)) + 1
         
-        for char in text:
-            current += char
-            if char in Config.SENTENCE_DELIMITERS and len(current.strip()) > Config.TRANSCRIPT_MIN_SENTENCE_LENGTH:
-                sentences.append(current.strip() + " ")
-                current = ""
+        start = 0
         
-        # Add remaining text
-        if current.strip():
-            sentences.append(current.strip())
+        # Pieces too short to stand alone are merged into the following sentence
+        for end in ends.tolist():
+            sentence = data[start:end].decode('utf-8').strip()
+            if len(sentence) > Config.TRANSCRIPT_MIN_SENTENCE_LENGTH:
+                yield sentence + " "
+                start = end
         
-        return sentences
+        # Yield remaining text
+        remainder = data[start:].decode('utf-8').strip()
+        if remainder:
+            yield remainder
     
     def _create_overlap(self, chunk: str) -> str:
         """Create overlap buffer from end of chunk."""
         if len(chunk) <= self.overlap_size:
             return chunk
         
-        # Take last overlap_size characters, but start at word boundary
-        overlap = chunk[-self.overlap_size:]
-        space_idx = overlap.find(' ')
-        if space_idx > 0:
-            overlap = overlap[space_idx:]
+        # Take last overlap_size characters, but start at word boundary; search the
+        # chunk in place so only the final overlap is sliced out
+        start = len(chunk) - self.overlap_size if self.overlap_size > 0 else 0  # chunk[-0:] is the whole chunk
+        space_idx = chunk.find(' ', start)
+        if space_idx > start:
+            start = space_idx
+        
+        return chunk[start:].strip() + " "
+
+
+class TranscriptCache:
+    """Content-addressed on-disk cache of TranscriptInsights (one JSON file per transcript)."""
+    
+    INSIGHT_FIELDS = ("early_adopter_products", "emerging_topics", "problem_spaces",
+                      "behavioral_patterns", "educational_demand")
+    
+    def __init__(self, cache_dir: str = Config.TRANSCRIPT_CACHE_DIR,
+                 max_entries: int = Config.TRANSCRIPT_CACHE_MAX_ENTRIES):
+        """
+        Initialize cache directory and size limit.
+        
+        Args:
+            cache_dir: Directory holding cached insight files
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        # Entries counted once here and tracked on put, so the directory is only rescanned to evict
+        self._entry_count = sum(1 for _ in self.cache_dir.glob("*.json"))
+    
+    @staticmethod
+    def make_key(transcript: str, transcript_date: str) -> str:
+        """Hash the transcript together with every setting that changes the extraction."""
+        material = "\x1f".join([
+            transcript, transcript_date, Config.CLAUDE_MODEL,
+            str(Config.TRANSCRIPT_MAX_CHUNK_SIZE), str(Config.TRANSCRIPT_MAX_TOKENS),
+            str(Config.TRANSCRIPT_OVERLAP_SIZE)
+        ])
+        return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[TranscriptInsights]:
+        """Return cached insights for key, or None on a miss or unreadable entry."""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable transcript cache entry {key}: {e}")
+            return None
+        
+        # JSON has no tuples; restore the InsightTuple shape
+        for field in self.INSIGHT_FIELDS:
+            data[field] = [tuple(insight) for insight in data[field]]
+        return TranscriptInsights(**data)
+    
+    def put(self, key: str, insights: TranscriptInsights):
+        """Store insights under key, evicting least recently used entries past the limit."""
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(".tmp")
+        is_new = not path.exists()
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(asdict(insights), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write transcript cache entry {key}: {e}")
+            return
         
-        return overlap.strip() + " "
+        if is_new:
+            self._entry_count += 1
+            if self._entry_count > self.max_entries:
+                self._evict()
+    
+    def _evict(self):
+        """Remove the least recently used entries, trimming well below max_entries so evictions are batched."""
+        try:
+            entries = [(entry.stat().st_mtime, entry.path) for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith(".json")]
+            target = int(self.max_entries * Config.TRANSCRIPT_CACHE_EVICT_TO)
+            if len(entries) > self.max_entries:
+                entries.sort()
+                for _, path in entries[:len(entries) - target]:
+                    Path(path).unlink(missing_ok=True)
+                self._entry_count = target
+            else:
+                self._entry_count = len(entries)  # Another process already trimmed the directory
+        except OSError as e:
+            logger.warning(f"Could not evict transcript cache entries: {e}")
 
 
 class TranscriptProcessor:
     """Main processor for extracting insights from transcripts using DSPy."""
     
-    def __init__(self, api_key: str = None):
-        """Initialize processor with Claude API key."""
+    # DSPy predictors are built once per process and shared by all processors
+    _EXTRACTORS_INITIALIZED = False
+    _EXTRACT_PRODUCTS = None
+    _EXTRACT_TOPICS = None
+    _EXTRACT_PROBLEMS = None
+    _EXTRACT_BEHAVIORS = None
+    _EXTRACT_EDUCATION = None
+    _init_lock = threading.Lock()
+    
+    def __init__(self, api_key: str = None, use_cache: bool = Config.TRANSCRIPT_CACHE_ENABLED):
+        """
+        Initialize processor with Claude API key.
+        
+        Args:
+            api_key: Claude API key (defaults to CLAUDE_API_KEY)
+            use_cache: Reuse insights for transcripts that were already processed
+        """
         try:
             import dspy
         except ImportError:
@@ -143,31 +330,74 @@ class TranscriptProcessor:
             raise TranscriptProcessingError(f"DSPy initialization failed: {str(e)}")
         
         # Initialize components
-        self.chunker = TranscriptChunker()
+        self.chunker = TranscriptChunker(max_chunk_tokens=Config.TRANSCRIPT_MAX_TOKENS)
+        self.cache = TranscriptCache() if use_cache else None
         self._setup_extractors()
     
     def _setup_extractors(self):
-        """Setup DSPy signature extractors."""
-        import dspy
-        from .transcript_signatures import (
-            ExtractEarlyAdopterProducts,
-            ExtractEmergingTopics,
-            ExtractProblemSpaces,
-            ExtractBehaviorPatterns,
-            ExtractEducationalDemand
-        )
+        """Setup DSPy signature extractors (created on first use, then shared)."""
+        cls = type(self)
+        if not cls._EXTRACTORS_INITIALIZED:
+            with cls._init_lock:
+                if not cls._EXTRACTORS_INITIALIZED:
+                    import dspy
+                    from .transcript_signatures import (
+                        ExtractEarlyAdopterProducts,
+                        ExtractEmergingTopics,
+                        ExtractProblemSpaces,
+                        ExtractBehaviorPatterns,
+                        ExtractEducationalDemand
+                    )
+                    
+                    # Create predictor instances
+                    cls._EXTRACT_PRODUCTS = dspy.Predict(ExtractEarlyAdopterProducts)
+                    cls._EXTRACT_TOPICS = dspy.Predict(ExtractEmergingTopics)
+                    cls._EXTRACT_PROBLEMS = dspy.Predict(ExtractProblemSpaces)
+                    cls._EXTRACT_BEHAVIORS = dspy.Predict(ExtractBehaviorPatterns)
+                    cls._EXTRACT_EDUCATION = dspy.Predict(ExtractEducationalDemand)
+                    cls._EXTRACTORS_INITIALIZED = True
         
-        # Create predictor instances
-        self.extract_products = dspy.Predict(ExtractEarlyAdopterProducts)
-        self.extract_topics = dspy.Predict(ExtractEmergingTopics)
-        self.extract_problems = dspy.Predict(ExtractProblemSpaces)
-        self.extract_behaviors = dspy.Predict(ExtractBehaviorPatterns)
-        self.extract_education = dspy.Predict(ExtractEducationalDemand)
+        self.extract_products = cls._EXTRACT_PRODUCTS
+        self.extract_topics = cls._EXTRACT_TOPICS
+        self.extract_problems = cls._EXTRACT_PROBLEMS
+        self.extract_behaviors = cls._EXTRACT_BEHAVIORS
+        self.extract_education = cls._EXTRACT_EDUCATION
+        
+        # Flat (category, predictor, output getter) table driving extraction
+        self._extractors = [
+            (category, extractor, attrgetter(category))
+            for category, extractor in (
+                ("products", self.extract_products),
+                ("topics", self.extract_topics),
+                ("problems", self.extract_problems),
+                ("behaviors", self.extract_behaviors),
+                ("education", self.extract_education),
+            )
+        ]
     
     def process_transcript(self, transcript: str, transcript_date: str = None) -> TranscriptInsights:
         """
         Process a full transcript and extract structured insights.
         
+        Synchronous wrapper around aprocess_transcript; must not be called
+        from inside a running event loop.
+        
+        Args:
+            transcript: Full transcript text
+            transcript_date: Date of the transcript (ISO format YYYY-MM-DD)
+            
+        Returns:
+            TranscriptInsights with all extracted information
+            
+        Raises:
+            TranscriptProcessingError: If processing fails
+        """
+        return asyncio.run(self.aprocess_transcript(transcript, transcript_date))
+    
+    async def aprocess_transcript(self, transcript: str, transcript_date: str = None) -> TranscriptInsights:
+        """
+        Process a full transcript, running all chunk/category extractions concurrently.
+        
         Args:
             transcript: Full transcript text
             transcript_date: Date of the transcript (ISO format YYYY-MM-DD)
@@ -187,39 +417,64 @@ class TranscriptProcessor:
         
         logger.info(f"Processing transcript from {transcript_date}, length: {len(transcript)}")
         
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(transcript, transcript_date)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached insights for previously processed transcript")
+                return cached
+        
         try:
-            # Step 1: Chunk transcript
-            chunks = self.chunker.chunk_transcript(transcript)
+            # Steps 1-2: Stream chunks into a bounded job queue drained by a fixed pool
+            # of workers; the DSPy predictors block, so each call runs in a thread.
+            # Extraction starts with the first chunk and chunks are never all resident.
+            extractors = self._extractors
+            jobs = asyncio.Queue(maxsize=Config.MAX_CONCURRENT_LLM)
+            results = {}
             
-            # Step 2: Extract insights from each chunk
-            all_products = []
-            all_topics = []
-            all_problems = []
-            all_behaviors = []
-            all_education = []
+            async def worker():
+                while True:
+                    job = await jobs.get()
+                    if job is None:
+                        return
+                    chunk_index, category_index, chunk = job
+                    category, extractor, get_insights = extractors[category_index]
+                    try:
+                        results[chunk_index, category_index] = await asyncio.to_thread(
+                            self._safe_extract, extractor, get_insights, chunk, category
+                        )
+                    except Exception as e:
+                        logger.warning("Failed to extract %s from chunk: %s", category, e)
             
-            for i, chunk in enumerate(chunks):
-                logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                
-                # Extract from each category
-                products = self._safe_extract(self.extract_products, chunk, "products")
-                topics = self._safe_extract(self.extract_topics, chunk, "topics")
-                problems = self._safe_extract(self.extract_problems, chunk, "problems")
-                behaviors = self._safe_extract(self.extract_behaviors, chunk, "behaviors")
-                education = self._safe_extract(self.extract_education, chunk, "education")
-                
-                all_products.extend(products)
-                all_topics.extend(topics)
-                all_problems.extend(problems)
-                all_behaviors.extend(behaviors)
-                all_education.extend(education)
+            workers = [asyncio.create_task(worker()) for _ in range(Config.MAX_CONCURRENT_LLM)]
+            n_chunks = 0
+            try:
+                for chunk in self.chunker.iter_chunks(transcript):
+                    for category_index in range(len(extractors)):
+                        await jobs.put((n_chunks, category_index, chunk))
+                    n_chunks += 1
+                for _ in workers:
+                    await jobs.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
+            
+            logger.info(f"Extracted {len(results)} chunk/category results from {n_chunks} chunks")
+            
+            # Reassemble in chunk order so each category matches sequential extraction
+            by_category = {category: [] for category, _, _ in extractors}
+            for chunk_index in range(n_chunks):
+                for category_index, (category, _, _) in enumerate(extractors):
+                    by_category[category].extend(results.get((chunk_index, category_index), []))
             
             # Step 3: Aggregate and deduplicate
-            final_products = self._aggregate_insights(all_products, transcript_date)
-            final_topics = self._aggregate_insights(all_topics, transcript_date)
-            final_problems = self._aggregate_insights(all_problems, transcript_date)
-            final_behaviors = self._aggregate_insights(all_behaviors, transcript_date)
-            final_education = self._aggregate_insights(all_education, transcript_date)
+            final_products = self._aggregate_insights(by_category["products"], transcript_date)
+            final_topics = self._aggregate_insights(by_category["topics"], transcript_date)
+            final_problems = self._aggregate_insights(by_category["problems"], transcript_date)
+            final_behaviors = self._aggregate_insights(by_category["behaviors"], transcript_date)
+            final_education = self._aggregate_insights(by_category["education"], transcript_date)
             
             # Step 4: Create final result
             insights = TranscriptInsights(
@@ -230,7 +485,7 @@ class TranscriptProcessor:
                 educational_demand=final_education,
                 transcript_date=transcript_date,
                 processing_metadata={
-                    "chunks_processed": len(chunks),
+                    "chunks_processed": n_chunks,
                     "total_insights": len(final_products) + len(final_topics) + len(final_problems) + len(final_behaviors) + len(final_education),
                     "transcript_length": len(transcript),
                     "processing_date": datetime.now().isoformat()
@@ -238,17 +493,20 @@ class TranscriptProcessor:
             )
             
             logger.info(f"Processing complete. Extracted {insights.processing_metadata['total_insights']} insights")
+            # Empty results may come from swallowed extraction failures; don't pin them
+            if cache_key is not None and insights.processing_metadata["total_insights"]:
+                self.cache.put(cache_key, insights)
             return insights
             
         except Exception as e:
             logger.error(f"Failed to process transcript: {e}")
             raise TranscriptProcessingError(f"Transcript processing failed: {str(e)}")
     
-    def _safe_extract(self, extractor, chunk: str, category: str) -> List[LLMInsight]:
+    def _safe_extract(self, extractor, get_insights, chunk: str, category: str) -> List[LLMInsight]:
         """Safely extract insights with error handling."""
         try:
             result = extractor(transcript_chunk=chunk)
-            insights = getattr(result, category, [])
+            insights = get_insights(result) or []
             
             # Validate and clean insights
             cleaned_insights = []
@@ -263,21 +521,30 @@ class TranscriptProcessor:
             return cleaned_insights
             
         except Exception as e:
-            logger.warning(f"Failed to extract {category} from chunk: {e}")
+            logger.warning("Failed to extract %s from chunk: %s", category, e)
             return []
     
     def _aggregate_insights(self, insights: List[LLMInsight], transcript_date: str) -> List[InsightTuple]:
-        """Attach transcript date and sort insights by significance."""
+        """Attach transcript date, drop duplicates and sort insights by significance."""
         if not insights:
             return []
 
-        # Attach date to each insight
-        final_insights = [
-            (text, transcript_date, score)
-            for text, score in insights
-        ]
+        # Overlapping chunks repeat insights; keep the strongest variant of each text.
+        # |score| is computed once per insight and reused as the sort key.
+        best: Dict[str, Tuple[float, InsightTuple]] = {}
+        for text, score in insights:
+            key = text.lower().strip()
+            magnitude = abs(score)
+            if key not in best or magnitude > best[key][0]:
+                best[key] = (magnitude, (text, transcript_date, score))
+        decorated = list(best.values())
 
-        # Sort by absolute score (most significant trends first)
-        final_insights.sort(key=lambda x: abs(x[2]), reverse=True)
+        # Sort by absolute score (most significant trends first); both paths are
+        # stable, so equal scores keep extraction order
+        if len(decorated) > _ARGSORT_MIN_INSIGHTS:
+            magnitudes = np.fromiter((m for m, _ in decorated), dtype=np.float64, count=len(decorated))
+            order = np.argsort(-magnitudes, kind='stable')
+            return [decorated[i][1] for i in order.tolist()]
 
-        return final_insights
\ No newline at end of file
+        decorated.sort(key=itemgetter(0), reverse=True)
+        return [insight for _, insight in decorated]
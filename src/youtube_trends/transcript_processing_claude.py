@@ -3,21 +3,128 @@ Transcript processing module using direct Claude API calls for structured insigh
 This replaces the DSPy version to enable true parallel processing.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
 import json
-from typing import List, Tuple, Dict
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
 from .config import Config
+from .optional_imports import json_loads as _json_loads
 
 logger = logging.getLogger(__name__)
 
+# Matches any single sentence delimiter character
+_DELIM_RE = re.compile(f"[{re.escape(Config.SENTENCE_DELIMITERS)}]")
+
+# Characters that affect JSON nesting: quotes, escapes and brackets
+_JSON_STRUCTURE_RE = re.compile(r'["\\{}\[\]]')
+
+def _extract_json(text: str, openers: str = '{[') -> Optional[str]:
+    """Return the first complete JSON value starting with one of `openers` embedded in text."""
+    starts = [idx for idx in map(text.find, openers) if idx != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    
+    depth = 0
+    in_string = False
+    escape_end = -1
+    for match in _JSON_STRUCTURE_RE.finditer(text, start):
+        pos = match.start()
+        if pos < escape_end:
+            continue  # character escaped by a preceding backslash
+        char = text[pos]
+        if in_string:
+            if char == '\\':
+                escape_end = pos + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    
+    return None  # unbalanced, e.g. a truncated response
+
 # Type definitions
 LLMInsight = Tuple[str, float]  # (insight_text, trend_score -1.0 to 1.0)
 InsightTuple = Tuple[str, str, float]  # (insight_text, transcript_date, trend_score)
 
+# Insight categories, in the order used for integer category codes
+CATEGORY_NAMES = [
+    'early_adopter_products',
+    'emerging_topics',
+    'problem_spaces',
+    'behavioral_patterns',
+    'educational_demand'
+]
+
+# What each category asks the model to extract
+CATEGORY_DESCRIPTIONS = {
+    "early_adopter_products": "Extract specific product names, tools, platforms, hardware, services, apps, and technologies mentioned or discussed. Focus on concrete products and technologies.",
+    
+    "emerging_topics": "Extract trending topics, innovation areas, and emerging themes that are gaining traction. Focus on concepts and trends rather than specific products.",
+    
+    "problem_spaces": "Extract problems, pain points, limitations, and challenges being discussed. Focus on issues that need solutions or are causing difficulties.",
+    
+    "behavioral_patterns": "Extract behavioral changes, usage patterns, workflow modifications, and adoption/abandonment behaviors being described.",
+    
+    "educational_demand": "Extract learning needs, skill gaps, training demands, certification requirements, and educational opportunities being discussed."
+}
+
+_CATEGORY_LIST = "\n".join(
+    f"- {category}: {CATEGORY_DESCRIPTIONS[category]}" for category in CATEGORY_NAMES
+)
+
+# Instructions shared by every chunk request, sent as the system prompt. Not marked
+# cache_control: at roughly 400 tokens it is below the 1024-token minimum cacheable
+# prefix for Sonnet models, so the marker would have no effect
+EXTRACTION_SYSTEM_PROMPT = [{
+    "type": "text",
+    "text": f"""Analyze the transcript excerpt you are given and extract insights for each of these categories:
+{_CATEGORY_LIST}
+
+The message may begin with a context section repeating the end of the previous excerpt. Use it only to understand the excerpt; extract insights from the transcript excerpt alone.
+
+Extract insights and score each from -1.0 to +1.0 where:
++1.0 = highly trending/rising/growing/urgent
+0.0 = neutral/stable/unclear
+-1.0 = declining/losing momentum/solved/obsolete
+
+Return ONLY a JSON object with one array per category in this exact format:
+{{
+    "early_adopter_products": [["insight description", score], ["another insight", score]],
+    "emerging_topics": [],
+    "problem_spaces": [],
+    "behavioral_patterns": [],
+    "educational_demand": []
+}}
+
+Focus on specific, actionable insights. If no relevant insights are found for a category, use an empty array: []"""
+}]
+
+def _estimate_tokens(text: str) -> int:
+    """Rough input token count for rate limiting (about four characters per token)."""
+    return len(text) // 4 + 1
+
+_SYSTEM_PROMPT_TOKENS = _estimate_tokens(EXTRACTION_SYSTEM_PROMPT[0]["text"])
+
 @dataclass
 class TranscriptInsights:
     """Container for all extracted insights from a transcript."""
@@ -28,6 +135,31 @@ class TranscriptInsights:
     educational_demand: List[InsightTuple]
     transcript_date: str
     processing_metadata: Dict
+    
+    def as_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Flatten all categories into parallel arrays.
+        
+        Returns:
+            (dates, texts, scores, category_codes) where category_codes index CATEGORY_NAMES
+        """
+        per_category = [getattr(self, name) for name in CATEGORY_NAMES]
+        total = sum(len(insights) for insights in per_category)
+        
+        dates = np.empty(total, dtype=object)
+        texts = np.empty(total, dtype=object)
+        scores = np.empty(total, dtype=np.float64)
+        codes = np.empty(total, dtype=np.int8)
+        
+        pos = 0
+        for code, insights in enumerate(per_category):
+            end = pos + len(insights)
+            if insights:
+                texts[pos:end], dates[pos:end], scores[pos:end] = zip(*insights)
+            codes[pos:end] = code
+            pos = end
+        
+        return dates, texts, scores, codes
 
 class TranscriptProcessingError(Exception):
     """Base exception for transcript processing errors."""
@@ -57,30 +189,46 @@ class TranscriptChunker:
         Returns:
             List of transcript chunks with preserved context
         """
+        return [context + core for context, core in self.chunk_transcript_parts(transcript)]
+    
+    def chunk_transcript_parts(self, transcript: str) -> List[Tuple[str, str]]:
+        """
+        Split transcript like chunk_transcript, keeping each chunk's overlap separate.
+        
+        Args:
+            transcript: Full transcript text
+            
+        Returns:
+            List of (context, core) pairs; context repeats the end of the previous
+            chunk and is empty for the first chunk
+        """
         if len(transcript) <= self.max_chunk_size:
-            return [transcript]
+            return [("", transcript)]
         
         # Split into sentences while preserving punctuation
         sentences = self._split_sentences(transcript)
         chunks = []
-        current_chunk = ""
+        current_sentences = []  # joined once per chunk rather than grown sentence by sentence
+        current_length = 0
         overlap_buffer = ""
         
         for sentence in sentences:
             # Check if adding this sentence would exceed limit
-            if len(current_chunk + sentence) > self.max_chunk_size and current_chunk:
+            if current_length + len(sentence) > self.max_chunk_size and current_sentences:
                 # Add current chunk
-                chunks.append(overlap_buffer + current_chunk)
+                chunks.append((overlap_buffer, "".join(current_sentences)))
                 
                 # Prepare overlap for next chunk
-                overlap_buffer = self._create_overlap(current_chunk)
-                current_chunk = sentence
+                overlap_buffer = self._create_overlap(self._tail(current_sentences))
+                current_sentences = [sentence]
+                current_length = len(sentence)
             else:
-                current_chunk += sentence
+                current_sentences.append(sentence)
+                current_length += len(sentence)
         
         # Add final chunk
-        if current_chunk:
-            chunks.append(overlap_buffer + current_chunk)
+        if current_sentences:
+            chunks.append((overlap_buffer, "".join(current_sentences)))
         
         logger.info(f"Split transcript into {len(chunks)} chunks")
         return chunks
@@ -88,22 +236,38 @@ class TranscriptChunker:
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences while preserving context."""
         sentences = []
-        current = ""
+        start = 0
         
-        for char in text:
-            current += char
-            if char in Config.SENTENCE_DELIMITERS and len(current.strip()) > Config.TRANSCRIPT_MIN_SENTENCE_LENGTH:
-                sentences.append(current.strip() + " ")
-                current = ""
+        # Only delimiter positions can end a sentence, so jump between them
+        # instead of walking every character
+        for match in _DELIM_RE.finditer(text):
+            end = match.end()
+            sentence = text[start:end].strip()
+            if len(sentence) > Config.TRANSCRIPT_MIN_SENTENCE_LENGTH:
+                sentences.append(sentence + " ")
+                start = end
         
         # Add remaining text
-        if current.strip():
-            sentences.append(current.strip())
+        remaining = text[start:].strip()
+        if remaining:
+            sentences.append(remaining)
         
         return sentences
     
+    def _tail(self, sentences: List[str]) -> str:
+        """Join only the trailing sentences needed to exceed overlap_size characters."""
+        if self.overlap_size <= 0:
+            # _create_overlap slices chunk[-0:], i.e. the whole chunk
+            return "".join(sentences)
+        length = 0
+        start = len(sentences)
+        while start > 0 and length <= self.overlap_size:
+            start -= 1
+            length += len(sentences[start])
+        return "".join(sentences[start:])
+    
     def _create_overlap(self, chunk: str) -> str:
-        """Create overlap buffer from end of chunk."""
+        """Create overlap buffer from end of chunk (or any tail of it longer than overlap_size)."""
         if len(chunk) <= self.overlap_size:
             return chunk
         
@@ -115,11 +279,148 @@ class TranscriptChunker:
         
         return overlap.strip() + " "
 
+class _RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets shared across threads and event loops."""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self._lock = threading.Lock()
+        self._capacity = (float(requests_per_minute), float(tokens_per_minute))
+        self._available = list(self._capacity)
+        self._updated = time.monotonic()
+    
+    def _reserve(self, tokens: int) -> float:
+        """Take one request and `tokens` from the buckets; return seconds to wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            
+            wait = 0.0
+            for i, (capacity, needed) in enumerate(zip(self._capacity, (1, tokens))):
+                # Buckets may go negative: later callers queue behind the debt
+                available = min(capacity, self._available[i] + elapsed * capacity / 60.0) - min(needed, capacity)
+                self._available[i] = available
+                if available < 0:
+                    wait = max(wait, -available * 60.0 / capacity)
+            return wait
+    
+    async def acquire(self, tokens: int):
+        """Wait until a request of roughly `tokens` input tokens fits within the limits."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+# One limiter per process, since the API limits apply to the key, not the processor
+_claude_limiter = _RateLimiter(Config.CLAUDE_REQUESTS_PER_MINUTE, Config.CLAUDE_INPUT_TOKENS_PER_MINUTE)
+
+class ResponseCache:
+    """SQLite-backed cache of raw Claude responses keyed by model, instructions and chunk prompt."""
+    
+    _shared: Dict[str, "ResponseCache"] = {}
+    _shared_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls, path: str = Config.CLAUDE_RESPONSE_CACHE_PATH) -> "ResponseCache":
+        """Return the process-wide cache for path, so processors created per thread share one connection."""
+        with cls._shared_lock:
+            cache = cls._shared.get(path)
+            if cache is None:
+                cache = cls._shared[path] = cls(path)
+            return cache
+    
+    def __init__(self, path: str = Config.CLAUDE_RESPONSE_CACHE_PATH,
+                 ttl: int = Config.CLAUDE_RESPONSE_CACHE_TTL,
+                 max_entries: int = Config.CLAUDE_RESPONSE_CACHE_MAX_ENTRIES):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path: SQLite database file
+            ttl: Seconds a cached response stays valid
+            max_entries: Entries kept before the oldest are evicted
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # One connection shared by every thread using this cache; the busy timeout makes
+        # writers from other processes wait for the lock instead of failing
+        self._conn = sqlite3.connect(path, timeout=Config.CLAUDE_RESPONSE_CACHE_BUSY_TIMEOUT,
+                                     check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            # WAL lets readers in other processes proceed while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (hash TEXT PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_ts ON responses (ts)")
+            # Approximate, as replaced keys and other processes' writes are not tracked;
+            # it only decides when to trim, and each trim recounts
+            self._entry_count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        
+        # Everything but the chunk prompt is fixed per process, so hash it once
+        self._key_prefix = hashlib.sha256(
+            "\x1f".join([Config.CLAUDE_MODEL, EXTRACTION_SYSTEM_PROMPT[0]["text"], ""]).encode()
+        )
+    
+    def make_key(self, prompt: str) -> str:
+        """Hash a chunk prompt together with the model and instructions that produced its response."""
+        key = self._key_prefix.copy()
+        key.update(prompt.encode())
+        return key.hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss or expired entry."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response FROM responses WHERE hash = ? AND ts >= ?",
+                    (key, int(time.time()) - self.ttl)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Ignoring unreadable response cache entry {key}: {e}")
+            return None
+        return row[0] if row else None
+    
+    def put(self, key: str, response: str):
+        """Store a response, trimming expired and the oldest entries once past the size limit."""
+        now = int(time.time())
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (hash, response, ts) VALUES (?, ?, ?)",
+                    (key, response, now)
+                )
+                self._entry_count += 1
+                if self._entry_count > self.max_entries:
+                    self._trim(now)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write response cache entry {key}: {e}")
+    
+    def _trim(self, now: int):
+        """Drop expired entries, then the oldest down to a low-water mark; caller holds the lock."""
+        self._conn.execute("DELETE FROM responses WHERE ts < ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM responses WHERE hash IN "
+            "(SELECT hash FROM responses ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+            (int(self.max_entries * Config.CLAUDE_RESPONSE_CACHE_EVICT_TO),)
+        )
+        self._entry_count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def close(self):
+        """Close the database connection; a closed shared cache is replaced on the next shared() call."""
+        with ResponseCache._shared_lock:
+            for path, cache in list(ResponseCache._shared.items()):
+                if cache is self:
+                    del ResponseCache._shared[path]
+        with self._lock:
+            self._conn.close()
+
 class ClaudeTranscriptProcessor:
     """Main processor for extracting insights from transcripts using direct Claude API calls."""
     
-    def __init__(self, api_key: str = None):
-        """Initialize processor with Claude API key."""
+    def __init__(self, api_key: str = None, use_cache: bool = Config.CLAUDE_RESPONSE_CACHE_ENABLED):
+        """Initialize processor with Claude API key and optional on-disk response cache."""
         try:
             import anthropic
             self._anthropic = anthropic
@@ -134,8 +435,15 @@ class ClaudeTranscriptProcessor:
                 )
             )
         
-        self.client = self._anthropic.Anthropic(api_key=self.api_key)
         self.chunker = TranscriptChunker()
+        self.cache = ResponseCache.shared() if use_cache else None
+        
+        # Rate limits, overload and connection errors are transient; retry them with backoff
+        self._retryable_errors = (
+            anthropic.RateLimitError,
+            anthropic.InternalServerError,
+            anthropic.APIConnectionError,  # includes APITimeoutError
+        )
         
         logger.info("Successfully initialized Claude transcript processor")
     
@@ -153,6 +461,10 @@ class ClaudeTranscriptProcessor:
         Raises:
             TranscriptProcessingError: If processing fails
         """
+        return asyncio.run(self.aprocess_transcript(transcript, transcript_date))
+    
+    async def aprocess_transcript(self, transcript: str, transcript_date: str = None) -> TranscriptInsights:
+        """Async variant of process_transcript; all chunks are extracted concurrently."""
         if not transcript.strip():
             raise TranscriptProcessingError(Config.ERROR_MESSAGES["empty_transcript"])
         
@@ -164,45 +476,31 @@ class ClaudeTranscriptProcessor:
         
         try:
             # Step 1: Chunk transcript
-            chunks = self.chunker.chunk_transcript(transcript)
+            chunks = self.chunker.chunk_transcript_parts(transcript)
             
-            # Step 2: Extract insights from each chunk for all categories
-            all_insights = {
-                'early_adopter_products': [],
-                'emerging_topics': [],
-                'problem_spaces': [],
-                'behavioral_patterns': [],
-                'educational_demand': []
-            }
+            # Step 2: Extract all categories from every chunk at once, bounded so
+            # we stay within the API rate limit
+            semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_LLM)
             
-            for i, chunk in enumerate(chunks):
-                logger.info(f"Processing chunk {i+1}/{len(chunks)}")
+            # The async client's connection pool is bound to the running event loop,
+            # so each run opens and closes its own
+            # Retries are handled in _extract_all_categories, so disable the client's own
+            async with self._anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0) as client:
+                async def extract(chunk_index: int, context: str, core: str) -> Dict[str, List[LLMInsight]]:
+                    async with semaphore:
+                        logger.info("Processing chunk %d/%d", chunk_index + 1, len(chunks))
+                        return await self._extract_all_categories(client, context, core)
                 
-                # Extract from each category
-                for category in all_insights.keys():
-                    insights = self._extract_insights_for_category(chunk, category)
-                    all_insights[category].extend(insights)
+                results = await asyncio.gather(*(
+                    extract(i, context, core) for i, (context, core) in enumerate(chunks)
+                ))
             
-            # Step 3: Aggregate and finalize insights
-            final_insights = {}
-            for category, insights in all_insights.items():
-                final_insights[category] = self._aggregate_insights(insights, transcript_date)
+            all_insights = {category: [] for category in CATEGORY_NAMES}
+            for chunk_insights in results:
+                self._merge_chunk_insights(all_insights, chunk_insights)
             
-            # Step 4: Create final result
-            insights = TranscriptInsights(
-                early_adopter_products=final_insights['early_adopter_products'],
-                emerging_topics=final_insights['emerging_topics'],
-                problem_spaces=final_insights['problem_spaces'],
-                behavioral_patterns=final_insights['behavioral_patterns'],
-                educational_demand=final_insights['educational_demand'],
-                transcript_date=transcript_date,
-                processing_metadata={
-                    "chunks_processed": len(chunks),
-                    "total_insights": sum(len(insights) for insights in final_insights.values()),
-                    "transcript_length": len(transcript),
-                    "processing_date": datetime.now().isoformat()
-                }
-            )
+            # Step 3: Aggregate and finalize insights
+            insights = self._build_insights(all_insights, transcript, transcript_date, len(chunks))
             
             logger.info(f"Processing complete. Extracted {insights.processing_metadata['total_insights']} insights")
             return insights
@@ -211,105 +509,233 @@ class ClaudeTranscriptProcessor:
             logger.error(f"Failed to process transcript: {e}")
             raise TranscriptProcessingError(f"Transcript processing failed: {str(e)}")
     
-    def _extract_insights_for_category(self, chunk: str, category: str) -> List[LLMInsight]:
-        """Extract insights for a specific category using Claude API."""
+    def process_transcript_batch(self, transcripts: List[Tuple[str, str]]) -> List[TranscriptInsights]:
+        """
+        Process many transcripts through the Message Batches API.
         
-        try:
-            # Build prompt for this category
-            prompt = self._build_category_prompt(chunk, category)
+        Every chunk prompt is submitted as one batch, which is billed at half the
+        price of individual calls but may take minutes to complete, so this suits
+        offline runs rather than interactive use.
+        
+        Args:
+            transcripts: List of (transcript_text, transcript_date) pairs
             
-            # Call Claude API
-            response = self.client.messages.create(
-                model=Config.CLAUDE_MODEL,
-                max_tokens=Config.CLAUDE_MAX_TOKENS,
-                messages=[{"role": "user", "content": prompt}]
-            )
+        Returns:
+            TranscriptInsights for each transcript, in input order
             
-            # Parse response
-            insights = self._parse_insights_response(response.content[0].text)
+        Raises:
+            TranscriptProcessingError: If the batch cannot be submitted or fails
+        """
+        prepared = []
+        requests = []
+        all_insights = []
+        cache_keys = {}  # custom_id -> response cache key for submitted chunks
+        for tid, (transcript, transcript_date) in enumerate(transcripts):
+            if not transcript.strip():
+                raise TranscriptProcessingError(Config.ERROR_MESSAGES["empty_transcript"])
+            transcript_date = transcript_date or datetime.now().strftime(Config.DATE_FORMAT)
+            chunks = self.chunker.chunk_transcript_parts(transcript)
+            prepared.append((transcript, transcript_date, len(chunks)))
+            transcript_insights = {category: [] for category in CATEGORY_NAMES}
+            all_insights.append(transcript_insights)
             
-            # Validate and clean insights
-            cleaned_insights = []
-            for insight in insights:
-                if isinstance(insight, (list, tuple)) and len(insight) >= 2:
-                    text, score = str(insight[0]).strip(), float(insight[1])
-                    # Clamp score to valid range
-                    score = Config.validate_score(score)
-                    if text:  # Only keep non-empty insights
-                        cleaned_insights.append((text, score))
+            for cidx, (context, core) in enumerate(chunks):
+                # custom_id only allows [a-zA-Z0-9_-]
+                custom_id = f"{tid}-{cidx}"
+                prompt = self._build_chunk_prompt(context, core)
+                if self.cache:
+                    cache_key = self.cache.make_key(prompt)
+                    cached = self.cache.get(cache_key)
+                    if cached is not None:
+                        self._merge_chunk_insights(transcript_insights, self._parse_categories_response(cached))
+                        continue
+                    cache_keys[custom_id] = cache_key
+                
+                requests.append({
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": Config.CLAUDE_MODEL,
+                        "max_tokens": Config.CLAUDE_CHUNK_MAX_TOKENS,
+                        "system": EXTRACTION_SYSTEM_PROMPT,
+                        "messages": [{"role": "user", "content": prompt}]
+                    }
+                })
+        
+        if requests:
+            self._run_batch(requests, all_insights, cache_keys)
+        
+        return [
+            self._build_insights(insights, transcript, transcript_date, num_chunks)
+            for insights, (transcript, transcript_date, num_chunks) in zip(all_insights, prepared)
+        ]
+    
+    def _run_batch(self, requests: List[Dict], all_insights: List[Dict[str, List[LLMInsight]]],
+                   cache_keys: Dict[str, str]):
+        """Submit requests as one Message Batch, wait for it and merge each result into its transcript."""
+        client = self._anthropic.Anthropic(api_key=self.api_key)
+        try:
+            batch = client.messages.batches.create(requests=requests)
+            logger.info("Submitted batch %s with %d requests", batch.id, len(requests))
             
-            return cleaned_insights
+            # Poll with exponential backoff until the batch has finished
+            wait = Config.CLAUDE_BATCH_POLL_INTERVAL
+            while batch.processing_status != "ended":
+                time.sleep(wait)
+                wait = min(wait * 2, Config.CLAUDE_BATCH_MAX_POLL_INTERVAL)
+                batch = client.messages.batches.retrieve(batch.id)
             
+            for entry in client.messages.batches.results(batch.id):
+                if entry.result.type != "succeeded":
+                    logger.warning("Batch request %s did not succeed: %s", entry.custom_id, entry.result.type)
+                    continue
+                response_text = entry.result.message.content[0].text
+                if entry.custom_id in cache_keys:
+                    self.cache.put(cache_keys[entry.custom_id], response_text)
+                self._merge_chunk_insights(
+                    all_insights[int(entry.custom_id.split("-", 1)[0])],
+                    self._parse_categories_response(response_text)
+                )
         except Exception as e:
-            logger.warning(f"Failed to extract {category} from chunk: {e}")
-            return []
+            logger.error(f"Failed to process transcript batch: {e}")
+            raise TranscriptProcessingError(f"Batch processing failed: {str(e)}")
     
-    def _build_category_prompt(self, chunk: str, category: str) -> str:
-        """Build prompt for extracting insights from a specific category."""
+    @staticmethod
+    def _merge_chunk_insights(all_insights: Dict[str, List[LLMInsight]], chunk_insights: Dict[str, List[LLMInsight]]):
+        """Append one chunk's per-category insights to a transcript's buckets."""
+        for category, insights in chunk_insights.items():
+            all_insights[category].extend(insights)
+    
+    def _build_insights(self, all_insights: Dict[str, List[LLMInsight]], transcript: str,
+                        transcript_date: str, num_chunks: int) -> TranscriptInsights:
+        """Aggregate per-category insights into the final result."""
+        final_insights = {}
+        for category, insights in all_insights.items():
+            final_insights[category] = self._aggregate_insights(insights, transcript_date)
         
-        category_descriptions = {
-            "early_adopter_products": "Extract specific product names, tools, platforms, hardware, services, apps, and technologies mentioned or discussed. Focus on concrete products and technologies.",
+        return TranscriptInsights(
+            early_adopter_products=final_insights['early_adopter_products'],
+            emerging_topics=final_insights['emerging_topics'],
+            problem_spaces=final_insights['problem_spaces'],
+            behavioral_patterns=final_insights['behavioral_patterns'],
+            educational_demand=final_insights['educational_demand'],
+            transcript_date=transcript_date,
+            processing_metadata={
+                "chunks_processed": num_chunks,
+                "total_insights": sum(len(insights) for insights in final_insights.values()),
+                "transcript_length": len(transcript),
+                "processing_date": datetime.now().isoformat()
+            }
+        )
+    
+    async def _extract_all_categories(self, client, context: str, core: str) -> Dict[str, List[LLMInsight]]:
+        """Extract insights for every category from one chunk with a single Claude call."""
+        
+        try:
+            # Build the chunk message; the shared instructions go in the cached system prompt
+            prompt = self._build_chunk_prompt(context, core)
             
-            "emerging_topics": "Extract trending topics, innovation areas, and emerging themes that are gaining traction. Focus on concepts and trends rather than specific products.",
+            # Identical chunks (re-runs of the same video) replay the stored response
+            cache_key = self.cache.make_key(prompt) if self.cache else None
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return self._parse_categories_response(cached)
             
-            "problem_spaces": "Extract problems, pain points, limitations, and challenges being discussed. Focus on issues that need solutions or are causing difficulties.",
+            # Call Claude API within the rate limits, retrying transient failures
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(Config.CLAUDE_RETRY_ATTEMPTS),
+                wait=wait_exponential_jitter(initial=Config.NETWORK_RETRY_INITIAL_WAIT, max=Config.CLAUDE_RETRY_MAX_WAIT),
+                retry=retry_if_exception_type(self._retryable_errors),
+                reraise=True
+            ):
+                with attempt:
+                    await _claude_limiter.acquire(_estimate_tokens(prompt) + _SYSTEM_PROMPT_TOKENS)
+                    # Stream the reply so the event loop services other chunks'
+                    # requests while this one is still generating
+                    parts = []
+                    async with client.messages.stream(
+                        model=Config.CLAUDE_MODEL,
+                        max_tokens=Config.CLAUDE_CHUNK_MAX_TOKENS,
+                        system=EXTRACTION_SYSTEM_PROMPT,
+                        messages=[{"role": "user", "content": prompt}]
+                    ) as stream:
+                        async for text in stream.text_stream:
+                            parts.append(text)
             
-            "behavioral_patterns": "Extract behavioral changes, usage patterns, workflow modifications, and adoption/abandonment behaviors being described.",
+            response_text = "".join(parts)
+            if cache_key:
+                self.cache.put(cache_key, response_text)
+            return self._parse_categories_response(response_text)
             
-            "educational_demand": "Extract learning needs, skill gaps, training demands, certification requirements, and educational opportunities being discussed."
-        }
-        
-        description = category_descriptions[category]
+        except Exception as e:
+            logger.warning("Failed to extract insights from chunk: %s", e)
+            return {}
+    
+    def _build_chunk_prompt(self, context: str, core: str) -> str:
+        """Build the per-chunk user message; the instructions live in the system prompt."""
+        if not context:
+            return f"""Transcript excerpt:
+{core}"""
         
-        return f"""Analyze this transcript excerpt and extract insights related to: {description}
+        return f"""Context (do not extract from):
+{context}
 
 Transcript excerpt:
-{chunk}
-
-Extract insights and score each from -1.0 to +1.0 where:
-+1.0 = highly trending/rising/growing/urgent
-0.0 = neutral/stable/unclear
--1.0 = declining/losing momentum/solved/obsolete
-
-Return ONLY a JSON array in this exact format:
-[
-    ["insight description", score],
-    ["another insight", score]
-]
+{core}"""
 
-Focus on specific, actionable insights. If no relevant insights are found, return an empty array: []"""
-
-    def _parse_insights_response(self, response_text: str) -> List[List]:
-        """Parse Claude's response containing insights array."""
+    def _parse_categories_response(self, response_text: str) -> Dict[str, List[LLMInsight]]:
+        """Parse Claude's response object and clean the insights for each category."""
         try:
-            # Extract JSON array from response
-            start_idx = response_text.find('[')
-            end_idx = response_text.rfind(']') + 1
-            
-            if start_idx == -1 or end_idx == 0:
-                return []  # No array found, return empty
-            
-            json_str = response_text[start_idx:end_idx]
-            insights_array = json.loads(json_str)
+            # Extract JSON object from response
+            json_str = _extract_json(response_text, '{')
+            if json_str is None:
+                return {}  # No complete object found, return empty
             
-            return insights_array if isinstance(insights_array, list) else []
+            parsed = _json_loads(json_str)
+            if not isinstance(parsed, dict):
+                return {}
             
         except (json.JSONDecodeError, ValueError) as e:
             logger.warning(f"Failed to parse insights response: {e}")
-            return []
+            return {}
+        
+        return {
+            category: self._clean_insights(parsed[category])
+            for category in CATEGORY_NAMES
+            if isinstance(parsed.get(category), list)
+        }
+    
+    def _clean_insights(self, insights: List[List]) -> List[LLMInsight]:
+        """Keep well-formed insights and clamp their scores."""
+        cleaned_insights = []
+        for insight in insights:
+            if isinstance(insight, (list, tuple)) and len(insight) >= 2:
+                try:
+                    text, score = str(insight[0]).strip(), float(insight[1])
+                except (TypeError, ValueError):
+                    continue
+                # Clamp score to valid range
+                score = Config.validate_score(score)
+                if text:  # Only keep non-empty insights
+                    cleaned_insights.append((text, score))
+        
+        return cleaned_insights
     
     def _aggregate_insights(self, insights: List[LLMInsight], transcript_date: str) -> List[InsightTuple]:
-        """Attach transcript date and sort insights by significance."""
+        """Attach transcript date, drop duplicates and sort insights by significance."""
         if not insights:
             return []
 
-        # Attach date to each insight
-        final_insights = [
-            (text, transcript_date, score)
-            for text, score in insights
-        ]
+        # Neighbouring chunks can still report the same insight; keep the
+        # strongest variant of each text
+        best: Dict[str, InsightTuple] = {}
+        for text, score in insights:
+            key = text.lower().strip()
+            if key not in best or abs(score) > abs(best[key][2]):
+                best[key] = (text, transcript_date, score)
+        final_insights = list(best.values())
 
         # Sort by absolute score (most significant trends first)
         final_insights.sort(key=lambda x: abs(x[2]), reverse=True)
 
-        return final_insights
\ No newline at end of file
+        return final_insights
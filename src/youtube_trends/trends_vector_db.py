@@ -6,17 +6,88 @@ Uses ChromaDB with built-in embeddings (no API keys required).
 """
 
 import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
 import json
+import hashlib
+import heapq
+import copy
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Columns a run's trend results must provide
+_REQUIRED_COLUMNS = ('date', 'category', 'information', 'score')
+
+# Date formats found in trend results, tried in order
+_DATE_FORMATS = (
+    "%Y-%m-%d",      # 2024-08-01
+    "%m/%d/%y",      # 10/18/23
+    "%m/%d/%Y",      # 10/18/2023
+    "%d/%m/%Y",      # 18/10/2023
+    "%d-%m-%Y",      # 18-10-2023
+)
+# Dates matching no format sort before everything else
+_UNPARSEABLE_DATE = pd.Timestamp(1900, 1, 1)
+
+def _parse_dates(dates: pd.Series) -> pd.Series:
+    """Parse a series of date strings, trying each known format only on values still unparsed."""
+    parsed = pd.to_datetime(dates, format=_DATE_FORMATS[0], errors='coerce')
+    for fmt in _DATE_FORMATS[1:]:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(dates[missing], format=fmt, errors='coerce')
+    return parsed.fillna(_UNPARSEABLE_DATE)
+
+@lru_cache(maxsize=8192)
+def _date_ordinal(date_str: str) -> int:
+    """Scalar _date_ordinals for a single date, e.g. a search bound; memoized across calls."""
+    if not date_str:
+        return 0
+    
+    # Plain YYYY-MM-DD is the common case and fromisoformat is much faster than strptime
+    if len(date_str) == 10 and date_str[4] == date_str[7] == "-":
+        try:
+            parsed = datetime.fromisoformat(date_str)
+            return parsed.year * 10000 + parsed.month * 100 + parsed.day
+        except ValueError:
+            pass
+    
+    for fmt in _DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+            return parsed.year * 10000 + parsed.month * 100 + parsed.day
+        except ValueError:
+            continue
+    return _UNPARSEABLE_DATE.year * 10000 + _UNPARSEABLE_DATE.month * 100 + _UNPARSEABLE_DATE.day
+
+def _date_ordinals(dates: pd.Series) -> List[int]:
+    """Encode date strings as YYYYMMDD ints ChromaDB can range-filter; missing dates become 0."""
+    parsed = _parse_dates(dates)
+    ordinals = parsed.dt.year * 10000 + parsed.dt.month * 100 + parsed.dt.day
+    return ordinals.where(dates != "", 0).astype(int).tolist()
+
+def _fill_indexed_metadata(metadatas: List[Dict[str, Any]]) -> int:
+    """Set date_ordinal and manual_grade_set in place where missing; return how many dicts changed."""
+    missing = [metadata for metadata in metadatas
+               if "date_ordinal" not in metadata or "manual_grade_set" not in metadata]
+    if not missing:
+        return 0
+    ordinals = _date_ordinals(pd.Series([metadata.get("date") or "" for metadata in missing], dtype=object))
+    for metadata, ordinal in zip(missing, ordinals):
+        metadata.setdefault("date_ordinal", ordinal)
+        metadata.setdefault("manual_grade_set", "manual_grade" in metadata)
+    return len(missing)
+
 class TrendsVectorDB:
     """Simple vector database for YouTube trends analysis results."""
     
@@ -25,6 +96,7 @@ class TrendsVectorDB:
         try:
             import chromadb
             from chromadb.config import Settings
+            from chromadb.utils import embedding_functions
             self._chromadb = chromadb
         except ImportError:
             raise Exception("ChromaDB required: pip install chromadb")
@@ -39,38 +111,217 @@ class TrendsVectorDB:
             settings=Settings(anonymized_telemetry=False)
         )
         
+        # Same default model Chroma uses for documents; held here so query
+        # embeddings can be computed (and cached) outside collection.query
+        self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        self._embed_query = lru_cache(maxsize=Config.VECTOR_DB_QUERY_CACHE_SIZE)(self._compute_query_embedding)
+        # Formatted search() results keyed by the full argument tuple; cleared on every write
+        # through this instance and whenever the collection count changes underneath it
+        self._search_cache: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+        
         # Get or create collection
         self.collection_name = "youtube_trends"
         try:
-            self.collection = self.client.get_collection(name=self.collection_name)
+            self.collection = self.client.get_collection(
+                name=self.collection_name,
+                embedding_function=self._embedding_function
+            )
             logger.info(f"Connected to existing collection: {self.collection_name}")
         except:
             self.collection = self.client.create_collection(
                 name=self.collection_name,
+                embedding_function=self._embedding_function,
                 metadata={"description": "YouTube trends with automatic embeddings"}
             )
             logger.info(f"Created new collection: {self.collection_name}")
+        
+        # Runs already added to the collection (keyed to their file's size and mtime),
+        # persisted so reloading an unchanged run is a no-op
+        self._ingested_file = self.db_path / Config.FILES["ingested_runs"]
+        self._ingested_runs = self._load_ingested_runs()
+        
+        # Rows ingested by older versions, or added straight to the collection, lack
+        # the indexed fields filters rely on
+        self._backfill_marker = self.db_path / Config.FILES["metadata_backfill_marker"]
+        self._known_count = self.collection.count()
+        self._backfill_metadata()
+        
+        # Every trend's score as one array, so score aggregates skip the metadata scan;
+        # loaded on first use and tied to the collection fingerprint it was built for
+        self._scores_file = self.db_path / Config.FILES["score_column"]
+        self._scores: Optional[np.ndarray] = None
+        self._scores_fingerprint: Optional[str] = None
+    
+    def _score_column(self) -> np.ndarray:
+        """Every trend's score, rebuilt from the collection if it changed since the column was saved."""
+        fingerprint = self._collection_fingerprint()
+        if self._scores is not None and self._scores_fingerprint == fingerprint:
+            return self._scores
+        
+        try:
+            with np.load(self._scores_file) as stored:
+                if str(stored["fingerprint"]) == fingerprint:
+                    self._scores, self._scores_fingerprint = stored["scores"], fingerprint
+                    return self._scores
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            pass
+        
+        batch_size = Config.VECTOR_DB_ADD_BATCH_SIZE
+        pages = []
+        for offset in range(0, self.collection.count(), batch_size):
+            page = self.collection.get(limit=batch_size, offset=offset, include=["metadatas"])
+            pages.append(np.fromiter((metadata.get("score", 0) for metadata in page["metadatas"]),
+                                     dtype=np.float64, count=len(page["metadatas"])))
+        scores = np.concatenate(pages) if pages else np.empty(0, dtype=np.float64)
+        self._save_scores(scores, fingerprint)
+        return scores
+    
+    def _save_scores(self, scores: np.ndarray, fingerprint: str):
+        """Persist the score column, with the collection fingerprint it matches, next to the database."""
+        self._scores = scores
+        self._scores_fingerprint = fingerprint
+        np.savez(self._scores_file, scores=scores, fingerprint=np.array(fingerprint))
+    
+    def _collection_fingerprint(self) -> str:
+        """Cheap token that changes when rows are added or removed: the count plus a hash of the newest IDs."""
+        count = self.collection.count()
+        tail_size = Config.VECTOR_DB_FINGERPRINT_TAIL
+        # Chroma pages in insertion order, so the last page holds the newest rows
+        tail = self.collection.get(offset=max(count - tail_size, 0), limit=tail_size, include=[])["ids"] if count else []
+        digest = hashlib.sha1("\n".join(tail).encode()).hexdigest()
+        return f"{count}:{digest}"
+    
+    def _backfill_is_current(self, fingerprint: str = None) -> bool:
+        """Whether every row had its indexed fields filled when the collection was last fingerprinted."""
+        try:
+            return self._backfill_marker.read_text() == (fingerprint or self._collection_fingerprint())
+        except OSError:
+            return False
+    
+    def _backfill_metadata(self):
+        """Add date_ordinal and manual_grade_set to rows that lack them, unless the collection is unchanged since the last pass."""
+        if self._backfill_is_current():
+            return
+        
+        batch_size = Config.VECTOR_DB_ADD_BATCH_SIZE
+        updated = 0
+        for offset in range(0, self.collection.count(), batch_size):
+            page = self.collection.get(limit=batch_size, offset=offset, include=["metadatas"])
+            stale = [(trend_id, metadata) for trend_id, metadata in zip(page["ids"], page["metadatas"])
+                     if "date_ordinal" not in metadata or "manual_grade_set" not in metadata]
+            if not stale:
+                continue
+            
+            updated += _fill_indexed_metadata([metadata for _, metadata in stale])
+            self.collection.update(
+                ids=[trend_id for trend_id, _ in stale],
+                metadatas=[metadata for _, metadata in stale]
+            )
+        
+        if updated:
+            logger.info(f"Backfilled indexed metadata on {updated} existing trends")
+        self._backfill_marker.write_text(self._collection_fingerprint())
+    
+    def _sync_external_writes(self):
+        """Catch up with rows written to the collection outside this instance since it last looked."""
+        count = self.collection.count()
+        if count != self._known_count:
+            self._known_count = count
+            self._search_cache.clear()
+            self._backfill_metadata()
+    
+    def _compute_query_embedding(self, query: str):
+        """Embed a single query string."""
+        return self._embedding_function([query])[0]
+    
+    def _load_ingested_runs(self) -> Dict[str, str]:
+        """Read the already ingested runs as run ID -> results file signature."""
+        try:
+            with open(self._ingested_file) as f:
+                ingested = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # Older databases stored a bare list of run IDs; without signatures every
+        # run is rechecked once (already stored rows are skipped by ID)
+        return ingested if isinstance(ingested, dict) else {}
+    
+    def _save_ingested_runs(self):
+        """Persist the ingested runs and their file signatures next to the database."""
+        with open(self._ingested_file, "w") as f:
+            json.dump(dict(sorted(self._ingested_runs.items())), f)
+    
+    def _run_signature(self, run_id: str) -> Optional[str]:
+        """Name, size and mtime of a run's results file; changes when rows are appended to it."""
+        trends_file = self._find_trends_file(Path(Config.RESULTS_BASE_DIR) / run_id)
+        if trends_file is None:
+            return None
+        try:
+            stat = trends_file.stat()
+        except OSError:
+            return None
+        return f"{trends_file.name}:{stat.st_size}:{stat.st_mtime_ns}"
+    
+    @staticmethod
+    def _find_trends_file(run_dir: Path) -> Optional[Path]:
+        """Return the run's trend results file, preferring Parquet over CSV."""
+        for file_key in ("trend_results_parquet", "trend_results"):
+            trends_file = run_dir / Config.FILES[file_key]
+            if trends_file.exists():
+                return trends_file
+        return None
     
     def load_trends_from_run(self, run_id: str) -> Dict[str, Any]:
         """Load trends from a single analysis run."""
+        # Taken before reading, so rows appended mid-load are picked up next time
+        signature = self._run_signature(run_id)
+        if signature is not None and self._ingested_runs.get(run_id) == signature:
+            return {"success": True, "trends_added": 0, "run_id": run_id, "already_loaded": True}
+        
+        prepared = self._prepare_run(run_id)
+        if not prepared["success"]:
+            return prepared
+        
+        # Add to ChromaDB
+        failed_batches = self._add_in_batches(prepared["ids"], prepared["documents"], prepared["metadatas"])
+        if failed_batches:
+            return {"success": False, "error": f"Failed to load run {run_id}: {len(failed_batches)} batch(es) could not be added"}
+        
+        self._ingested_runs[run_id] = signature
+        self._save_ingested_runs()
+        
+        return {
+            "success": True,
+            "trends_added": len(prepared["ids"]),
+            "run_id": run_id
+        }
+    
+    def _prepare_run(self, run_id: str) -> Dict[str, Any]:
+        """Read a run's trend results into ChromaDB ids, documents and metadatas without adding them."""
         results_dir = Path(Config.RESULTS_BASE_DIR)
         run_dir = results_dir / run_id
-        trends_file = run_dir / "trend_results.csv"
+        trends_file = self._find_trends_file(run_dir)
         
-        if not trends_file.exists():
-            return {"success": False, "error": f"No trend_results.csv found in {run_dir}"}
+        if trends_file is None:
+            return {"success": False, "error": f"No trend_results file found in {run_dir}"}
         
         try:
-            # Read the CSV file
-            df = pd.read_csv(trends_file)
+            # Read the results file; CSVs parse only the needed columns, with the
+            # text columns kept as strings instead of type-inferred
+            if trends_file.suffix == Config.EXTENSIONS["parquet"]:
+                df = pd.read_parquet(trends_file)
+            else:
+                df = pd.read_csv(
+                    trends_file,
+                    usecols=lambda col: col in _REQUIRED_COLUMNS,  # a callable tolerates missing columns
+                    dtype={'date': str, 'category': str, 'information': str}
+                )
             
             # Check if file is empty
             if df.empty:
                 return {"success": False, "error": "Empty CSV file"}
             
             # Validate expected columns
-            required_cols = ['date', 'category', 'information', 'score']
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = [col for col in _REQUIRED_COLUMNS if col not in df.columns]
             if missing_cols:
                 return {"success": False, "error": f"Missing columns: {missing_cols}"}
             
@@ -81,30 +332,29 @@ class TrendsVectorDB:
                 return {"success": False, "error": "No trends above score threshold"}
             
             # Prepare data for ChromaDB
-            ids = [f"{run_id}_{i}" for i in range(len(df))]
+            # Same "<run_id>_<i>" ids, built with C-level map instead of per-item f-strings
+            ids = list(map(f"{run_id}_".__add__, map(str, range(len(df)))))
             documents = df['information'].astype(str).tolist()
-            metadatas = []
-            
-            for _, row in df.iterrows():
-                metadata = {
-                    "date": str(row['date']),
-                    "category": str(row['category']),
-                    "score": float(row['score']),
-                    "run_id": run_id
-                }
-                metadatas.append(metadata)
-            
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas
-            )
+            # Convert each column once, then zip plain lists into dicts; map(str) keeps
+            # str() of each value (e.g. full Timestamps) where astype(str) would
+            # reformat datetimes
+            dates = df['date'].map(str)
+            metadatas = [
+                {"date": date, "date_ordinal": ordinal, "category": category, "score": score,
+                 "run_id": run_id, "manual_grade_set": False}
+                for date, ordinal, category, score in zip(
+                    dates.tolist(),
+                    _date_ordinals(dates),
+                    df['category'].astype(str).tolist(),
+                    df['score'].astype(float).tolist()
+                )
+            ]
             
             return {
                 "success": True,
-                "trends_added": len(df),
-                "run_id": run_id
+                "ids": ids,
+                "documents": documents,
+                "metadatas": metadatas
             }
             
         except pd.errors.EmptyDataError:
@@ -112,6 +362,60 @@ class TrendsVectorDB:
         except Exception as e:
             return {"success": False, "error": f"Failed to load run {run_id}: {str(e)}"}
     
+    def add_trends(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Add trends built outside a results run, filling in the indexed metadata filters rely on.
+        
+        Args:
+            ids: Unique trend IDs
+            documents: Trend texts
+            metadatas: Per-trend metadata; needs at least category, score, date and run_id
+            
+        Returns:
+            (start, end) index ranges of batches that could not be added
+        """
+        _fill_indexed_metadata(metadatas)
+        return self._add_in_batches(ids, documents, metadatas)
+    
+    def _add_in_batches(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> List[tuple]:
+        """Add rows not yet stored to the collection in fixed-size slabs; return (start, end) of slabs that failed."""
+        # Rows added here are fully indexed and their scores known, so an up-to-date
+        # backfill marker and score column stay up to date
+        fingerprint = self._collection_fingerprint()
+        backfill_current = self._backfill_is_current(fingerprint)
+        scores_current = self._scores is not None and self._scores_fingerprint == fingerprint
+        batch_size = Config.VECTOR_DB_ADD_BATCH_SIZE
+        failed_batches = []
+        added_scores = []
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            try:
+                # Skip rows already stored (e.g. from a partially failed earlier load) so they are not re-embedded
+                existing = set(self.collection.get(ids=ids[start:end], include=[])["ids"])
+                new_rows = [i for i in range(start, min(end, len(ids))) if ids[i] not in existing]
+                if not new_rows:
+                    continue
+                self.collection.add(
+                    ids=[ids[i] for i in new_rows],
+                    documents=[documents[i] for i in new_rows],
+                    metadatas=[metadatas[i] for i in new_rows]
+                )
+                added_scores.extend(metadatas[i]["score"] for i in new_rows)
+            except Exception as e:
+                failed_batches.append((start, end))
+                logger.warning(f"Failed to add trends {start}-{min(end, len(ids))}: {e}")
+        self._search_cache.clear()
+        self._known_count = self.collection.count()
+        if not (backfill_current or scores_current):
+            return failed_batches
+        
+        fingerprint = self._collection_fingerprint()
+        if backfill_current:
+            self._backfill_marker.write_text(fingerprint)
+        if scores_current:
+            self._save_scores(np.concatenate([self._scores, np.asarray(added_scores, dtype=np.float64)]), fingerprint)
+        return failed_batches
+    
     def load_all_available_runs(self) -> Dict[str, Any]:
         """Load trends from all available analysis runs."""
         results_dir = Path(Config.RESULTS_BASE_DIR)
@@ -119,29 +423,66 @@ class TrendsVectorDB:
         if not results_dir.exists():
             return {"success": False, "error": f"Results directory not found: {results_dir}"}
         
-        # Find all run directories with trend_results.csv
+        # Find all run directories with a trend_results file
         run_dirs = []
         for item in results_dir.iterdir():
-            if item.is_dir() and (item / "trend_results.csv").exists():
+            if item.is_dir() and self._find_trends_file(item) is not None:
                 run_dirs.append(item.name)
         
         if not run_dirs:
-            return {"success": False, "error": "No run directories with trend_results.csv found"}
+            return {"success": False, "error": "No run directories with trend_results found"}
         
-        # Load each run
-        total_added = 0
+        # Read every new run first, remembering where its rows start and end
         successful_runs = 0
         failed_runs = []
+        run_spans = []  # (run_id, start, end) into the combined lists
+        all_ids, all_documents, all_metadatas = [], [], []
         
+        new_runs = []
+        signatures = {run_id: self._run_signature(run_id) for run_id in run_dirs}
         for run_id in run_dirs:
-            result = self.load_trends_from_run(run_id)
-            if result["success"]:
-                total_added += result["trends_added"]
+            if signatures[run_id] is not None and self._ingested_runs.get(run_id) == signatures[run_id]:
                 successful_runs += 1
-                logger.info(f"Loaded {result['trends_added']} trends from {run_id}")
+                logger.debug("Skipping %s, already loaded", run_id)
             else:
+                new_runs.append(run_id)
+        
+        # File reads and parsing release the GIL, so prepare runs in parallel;
+        # map keeps results in run order so row offsets stay deterministic
+        max_workers = min(Config.VECTOR_DB_MAX_LOAD_WORKERS, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prepared_runs = list(executor.map(self._prepare_run, new_runs))
+        
+        for run_id, prepared in zip(new_runs, prepared_runs):
+            if not prepared["success"]:
                 failed_runs.append(run_id)
-                logger.warning(f"Failed to load {run_id}: {result['error']}")
+                logger.warning(f"Failed to load {run_id}: {prepared['error']}")
+                continue
+            
+            start = len(all_ids)
+            all_ids.extend(prepared["ids"])
+            all_documents.extend(prepared["documents"])
+            all_metadatas.extend(prepared["metadatas"])
+            run_spans.append((run_id, start, len(all_ids)))
+        
+        # Add everything in a few large slabs instead of one call per run
+        failed_batches = self._add_in_batches(all_ids, all_documents, all_metadatas)
+        
+        # A run is loaded only if none of its rows fell in a failed slab
+        total_added = 0
+        for run_id, start, end in run_spans:
+            if any(start < batch_end and batch_start < end for batch_start, batch_end in failed_batches):
+                failed_runs.append(run_id)
+                logger.warning(f"Failed to load {run_id}: ChromaDB add failed")
+                continue
+            
+            total_added += end - start
+            successful_runs += 1
+            self._ingested_runs[run_id] = signatures[run_id]
+            logger.info(f"Loaded {end - start} trends from {run_id}")
+        
+        if run_spans:
+            self._save_ingested_runs()
         
         return {
             "success": successful_runs > 0,
@@ -151,6 +492,29 @@ class TrendsVectorDB:
             "total_runs_found": len(run_dirs)
         }
     
+    @staticmethod
+    def _build_where(category: str = None,
+                     min_score: float = None,
+                     after_date: str = None,
+                     before_date: str = None) -> Optional[Dict[str, Any]]:
+        """Translate search filters into a ChromaDB where clause (None when unfiltered)."""
+        conditions = []
+        if category:
+            conditions.append({"category": category})
+        if min_score is not None:
+            conditions.append({"score": {"$gte": min_score}})
+        if after_date or before_date:
+            # date_ordinal is 0 for trends without a date; those never match a date range
+            conditions.append({"date_ordinal": {"$gte": _date_ordinal(after_date) if after_date else 1}})
+            if before_date:
+                conditions.append({"date_ordinal": {"$lte": _date_ordinal(before_date)}})
+        
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+    
     def search(self, 
                query: str, 
                top_k: int = 10, 
@@ -168,107 +532,52 @@ class TrendsVectorDB:
             after_date: Only include trends after this date (YYYY-MM-DD format)
             before_date: Only include trends before this date (YYYY-MM-DD format)
         """
-        # ChromaDB has limitations with complex where clauses, so we'll use simple filtering
-        # and do more complex filtering post-search
-        where_clause = None
-        if category:
-            where_clause = {"category": category}
-        elif min_score is not None:
-            where_clause = {"score": {"$gte": min_score}}
-        
-        # Get more results if we need to filter (since we'll filter post-search)
-        search_limit = top_k * 3 if (after_date or before_date or min_score) else top_k
-        
-        # Perform search
+        # Rows added by tools or other processes invalidate cached results, and date
+        # filters match on date_ordinal, which rows added straight to the collection lack
+        self._sync_external_writes()
+        
+        cache_key = (query, top_k, category, min_score, after_date, before_date)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            # Deep copy so callers mutating result dicts or metadata cannot corrupt the cache
+            return copy.deepcopy(cached)
+        
+        # Every filter runs inside ChromaDB, so no over-fetching or post-filtering is needed
         results = self.collection.query(
-            query_texts=[query],
-            n_results=search_limit,
-            where=where_clause,
+            query_embeddings=[self._embed_query(query)],
+            n_results=top_k,
+            where=self._build_where(category, min_score, after_date, before_date),
             include=["metadatas", "documents", "distances"]
         )
         
-        # Format results
-        formatted_results = []
-        if results["ids"] and len(results["ids"]) > 0:
-            for i in range(len(results["ids"][0])):
-                result = {
-                    "id": results["ids"][0][i],
-                    "text": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i],
-                    "similarity": 1.0 - results["distances"][0][i]  # Convert to similarity
-                }
-                formatted_results.append(result)
-        
-        # Apply post-search filtering
-        if after_date or before_date:
-            formatted_results = self._filter_by_date(formatted_results, after_date, before_date)
-        
-        # Apply score filtering if not already done in ChromaDB query
-        if min_score is not None and not where_clause:
-            formatted_results = [r for r in formatted_results if r["metadata"].get("score", 0) >= min_score]
-        
-        # Apply category filtering if we used score filtering in ChromaDB query
-        if category and min_score is not None:
-            formatted_results = [r for r in formatted_results if r["metadata"].get("category") == category]
-        
-        # Return only requested number of results
-        return formatted_results[:top_k]
-    
-    def _filter_by_date(self, results: List[Dict[str, Any]], after_date: str = None, before_date: str = None) -> List[Dict[str, Any]]:
-        """Filter results by date range, handling various date formats."""
-        from datetime import datetime
-        
-        def parse_date(date_str: str) -> datetime:
-            """Parse various date formats to datetime."""
-            date_formats = [
-                "%Y-%m-%d",      # 2024-08-01
-                "%m/%d/%y",      # 10/18/23
-                "%m/%d/%Y",      # 10/18/2023
-                "%Y-%m-%d",      # 2024-08-01
-                "%d/%m/%Y",      # 18/10/2023
-                "%d-%m-%Y",      # 18-10-2023
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            
-            # If no format works, try to handle partial dates
-            try:
-                # Handle formats like "2019-09-29"
-                return datetime.strptime(date_str, "%Y-%m-%d")
-            except:
-                # Return a very old date if parsing fails
-                return datetime(1900, 1, 1)
-        
-        filtered_results = []
-        
-        # Parse filter dates
-        after_dt = parse_date(after_date) if after_date else None
-        before_dt = parse_date(before_date) if before_date else None
+        if not results["ids"]:
+            return []
         
-        for result in results:
-            result_date_str = result["metadata"].get("date", "")
-            if not result_date_str:
-                continue
-                
-            result_dt = parse_date(result_date_str)
-            
-            # Apply date filters
-            if after_dt and result_dt < after_dt:
-                continue
-            if before_dt and result_dt > before_dt:
-                continue
-                
-            filtered_results.append(result)
+        formatted = [
+            {
+                "id": trend_id,
+                "text": text,
+                "metadata": metadata,
+                "distance": distance,
+                "similarity": 1.0 - distance  # Convert to similarity
+            }
+            for trend_id, text, metadata, distance in zip(
+                results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
         
-        return filtered_results
+        self._search_cache[cache_key] = formatted
+        if len(self._search_cache) > Config.VECTOR_DB_SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return copy.deepcopy(formatted)
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
+        """Get database statistics.
+        
+        The score distribution covers every trend; categories and runs are counted
+        over the first ``sample_size`` trends only, as listed in ``sampled_fields``.
+        """
         count = self.collection.count()
         
         if count == 0:
@@ -287,30 +596,17 @@ class TrendsVectorDB:
         )
         
         # Analyze metadata
-        categories = {}
-        runs = {}
-        scores = []
-        
-        if sample["metadatas"]:
-            for metadata in sample["metadatas"]:
-                # Count categories
-                category = metadata.get("category", "unknown")
-                categories[category] = categories.get(category, 0) + 1
-                
-                # Count runs
-                run_id = metadata.get("run_id", "unknown")
-                runs[run_id] = runs.get(run_id, 0) + 1
-                
-                # Collect scores
-                score = metadata.get("score", 0)
-                scores.append(score)
-        
-        # Score distribution
+        metadatas = sample["metadatas"] or []
+        categories = dict(Counter(metadata.get("category", "unknown") for metadata in metadatas))
+        runs = dict(Counter(metadata.get("run_id", "unknown") for metadata in metadatas))
+        
+        # Score distribution covers every trend via the score column, not just the sample
+        scores = self._score_column()
         score_dist = {
-            "high (>0.7)": len([s for s in scores if s > 0.7]),
-            "medium (0.3-0.7)": len([s for s in scores if 0.3 <= s <= 0.7]),
-            "low (<0.3)": len([s for s in scores if s < 0.3]),
-            "average": sum(scores) / len(scores) if scores else 0
+            "high (>0.7)": int(np.count_nonzero(scores > 0.7)),
+            "medium (0.3-0.7)": int(np.count_nonzero((scores >= 0.3) & (scores <= 0.7))),
+            "low (<0.3)": int(np.count_nonzero(scores < 0.3)),
+            "average": float(scores.mean()) if scores.size else 0
         }
         
         return {
@@ -318,7 +614,8 @@ class TrendsVectorDB:
             "categories": categories,
             "score_distribution": score_dist,
             "runs": runs,
-            "sample_size": sample_size
+            "sample_size": sample_size,
+            "sampled_fields": ["categories", "runs"]
         }
     
     def get_trending_topics(self, 
@@ -328,52 +625,64 @@ class TrendsVectorDB:
                           after_date: str = None,
                           before_date: str = None) -> List[Dict[str, Any]]:
         """Get trending topics (high-scoring trends)."""
-        # Search for generally trending terms
-        results = self.search(
-            query="trending popular emerging viral new",
-            top_k=top_k * 2,  # Get more to filter
-            category=category,
-            min_score=min_score,
-            after_date=after_date,
-            before_date=before_date
+        if after_date or before_date:
+            self._sync_external_writes()
+        
+        # Ranking is purely by score, so filter on metadata only and skip the vector search
+        candidates = self.collection.get(
+            where=self._build_where(category, min_score, after_date, before_date),
+            include=["metadatas"]
         )
         
-        # Sort by trend score and return top results
-        sorted_results = sorted(
-            results, 
-            key=lambda x: x["metadata"]["score"], 
-            reverse=True
+        top = heapq.nlargest(
+            top_k,
+            zip(candidates["ids"], candidates["metadatas"]),
+            key=lambda candidate: candidate[1]["score"]
         )
+        if not top:
+            return []
+        
+        # Fetch documents only for the winners
+        top_ids = [trend_id for trend_id, _ in top]
+        documents = self.collection.get(ids=top_ids, include=["documents"])
+        text_by_id = dict(zip(documents["ids"], documents["documents"]))
         
-        return sorted_results[:top_k]
+        return [
+            {"id": trend_id, "text": text_by_id.get(trend_id, ""), "metadata": metadata}
+            for trend_id, metadata in top
+        ]
     
     def analyze_category(self, category: str) -> Dict[str, Any]:
         """Analyze all trends in a specific category."""
-        # Get all trends in category (use empty query with category filter)
-        results = self.search(
-            query="",  # Empty query to get broad results
-            top_k=1000,  # Large number to get all
-            category=category
+        # Enumerate the category directly; no query embedding or vector search needed
+        raw = self.collection.get(
+            where={"category": category},
+            include=["metadatas", "documents"]
         )
         
-        if not results:
+        if not raw["ids"]:
             return {"error": f"No trends found for category: {category}"}
         
         # Analyze the results
-        scores = [r["metadata"]["score"] for r in results]
-        runs = set(r["metadata"]["run_id"] for r in results)
+        metadatas = raw["metadatas"]
+        scores = np.fromiter((metadata["score"] for metadata in metadatas), dtype=np.float64, count=len(metadatas))
+        runs = set(metadata["run_id"] for metadata in metadatas)
+        top = np.argsort(-scores, kind="stable")[:10]
         
         return {
             "category": category,
-            "total_trends": len(results),
+            "total_trends": len(scores),
             "score_stats": {
-                "average": sum(scores) / len(scores),
-                "max": max(scores),
-                "min": min(scores),
-                "high_score_count": len([s for s in scores if s > 0.7])
+                "average": float(scores.mean()),
+                "max": float(scores.max()),
+                "min": float(scores.min()),
+                "high_score_count": int(np.count_nonzero(scores > 0.7))
             },
             "runs_represented": len(runs),
-            "top_trends": sorted(results, key=lambda x: x["metadata"]["score"], reverse=True)[:10]
+            "top_trends": [
+                {"id": raw["ids"][i], "text": raw["documents"][i], "metadata": metadatas[i]}
+                for i in top
+            ]
         }
     
     def clear_database(self) -> bool:
@@ -382,8 +691,16 @@ class TrendsVectorDB:
             self.client.delete_collection(name=self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
+                embedding_function=self._embedding_function,
                 metadata={"description": "YouTube trends with automatic embeddings"}
             )
+            self._ingested_runs.clear()
+            self._save_ingested_runs()
+            self._known_count = 0
+            fingerprint = self._collection_fingerprint()
+            self._backfill_marker.write_text(fingerprint)
+            self._save_scores(np.empty(0, dtype=np.float64), fingerprint)
+            self._search_cache.clear()
             logger.info("Database cleared successfully")
             return True
         except Exception as e:
@@ -421,6 +738,7 @@ class TrendsVectorDB:
             current_metadata = result["metadatas"][0]
             current_metadata.update({
                 "manual_grade": is_interesting,
+                "manual_grade_set": True,  # indexed flag so graded/ungraded lookups can filter in ChromaDB
                 "manual_grade_timestamp": datetime.now().isoformat(),
                 "manual_grade_notes": notes or ""
             })
@@ -431,6 +749,7 @@ class TrendsVectorDB:
                 documents=[result["documents"][0]],
                 metadatas=[current_metadata]
             )
+            self._search_cache.clear()
             
             logger.info(f"Added manual grade to trend {trend_id}: {'interesting' if is_interesting else 'not interesting'}")
             return True
@@ -451,40 +770,21 @@ class TrendsVectorDB:
             List of ungraded trends
         """
         try:
-            # Get all trends
-            all_results = self.collection.get(
+            self._sync_external_writes()
+            where_clause = {"manual_grade_set": False}
+            if category:
+                where_clause = {"$and": [where_clause, {"category": category}]}
+            
+            results = self.collection.get(
+                where=where_clause,
                 include=["documents", "metadatas"],
-                limit=limit * 10  # Get more to filter
+                limit=limit
             )
             
-            if not all_results["ids"]:
-                return []
-            
-            # Filter ungraded trends
-            ungraded = []
-            for i in range(len(all_results["ids"])):
-                metadata = all_results["metadatas"][i]
-                
-                # Skip if already graded
-                if "manual_grade" in metadata:
-                    continue
-                
-                # Apply category filter
-                if category and metadata.get("category") != category:
-                    continue
-                
-                trend = {
-                    "id": all_results["ids"][i],
-                    "text": all_results["documents"][i],
-                    "metadata": metadata
-                }
-                ungraded.append(trend)
-                
-                # Stop when we have enough
-                if len(ungraded) >= limit:
-                    break
-            
-            return ungraded
+            return [
+                {"id": trend_id, "text": text, "metadata": metadata}
+                for trend_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+            ]
             
         except Exception as e:
             logger.error(f"Failed to get ungraded trends: {e}")
@@ -502,41 +802,21 @@ class TrendsVectorDB:
             List of graded trends
         """
         try:
-            # Get all trends
-            all_results = self.collection.get(
+            self._sync_external_writes()
+            where_clause = {"manual_grade_set": True}
+            if interesting_only is not None:
+                where_clause = {"$and": [where_clause, {"manual_grade": interesting_only}]}
+            
+            results = self.collection.get(
+                where=where_clause,
                 include=["documents", "metadatas"],
-                limit=limit * 10  # Get more to filter
+                limit=limit
             )
             
-            if not all_results["ids"]:
-                return []
-            
-            # Filter graded trends
-            graded = []
-            for i in range(len(all_results["ids"])):
-                metadata = all_results["metadatas"][i]
-                
-                # Skip if not graded
-                if "manual_grade" not in metadata:
-                    continue
-                
-                # Apply interesting filter
-                if interesting_only is not None:
-                    if metadata["manual_grade"] != interesting_only:
-                        continue
-                
-                trend = {
-                    "id": all_results["ids"][i],
-                    "text": all_results["documents"][i],
-                    "metadata": metadata
-                }
-                graded.append(trend)
-                
-                # Stop when we have enough
-                if len(graded) >= limit:
-                    break
-            
-            return graded
+            return [
+                {"id": trend_id, "text": text, "metadata": metadata}
+                for trend_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+            ]
             
         except Exception as e:
             logger.error(f"Failed to get graded trends: {e}")
@@ -545,26 +825,18 @@ class TrendsVectorDB:
     def get_grading_stats(self) -> Dict[str, Any]:
         """Get statistics about manual grading progress."""
         try:
-            # Get all trends
-            all_results = self.collection.get(
-                include=["metadatas"]
-            )
+            self._sync_external_writes()
+            total_trends = self.collection.count()
             
-            if not all_results["ids"]:
+            if total_trends == 0:
                 return {"total_trends": 0, "graded": 0, "ungraded": 0}
             
-            total_trends = len(all_results["ids"])
-            graded_count = 0
-            interesting_count = 0
-            not_interesting_count = 0
-            
-            for metadata in all_results["metadatas"]:
-                if "manual_grade" in metadata:
-                    graded_count += 1
-                    if metadata["manual_grade"]:
-                        interesting_count += 1
-                    else:
-                        not_interesting_count += 1
+            # count() takes no filter, so count matching IDs without fetching metadata
+            graded_count = len(self.collection.get(where={"manual_grade_set": True}, include=[])["ids"])
+            interesting_count = len(self.collection.get(
+                where={"$and": [{"manual_grade_set": True}, {"manual_grade": True}]}, include=[]
+            )["ids"])
+            not_interesting_count = graded_count - interesting_count
             
             ungraded_count = total_trends - graded_count
             graded_percentage = (graded_count / total_trends * 100) if total_trends > 0 else 0
@@ -581,4 +853,4 @@ class TrendsVectorDB:
             
         except Exception as e:
             logger.error(f"Failed to get grading stats: {e}")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 import json
 
 from .config import Config
+from .optional_imports import json_loads as _json_loads
 
 # Import all required configuration values at the top for clarity
 DEFAULT_NUM_QUERIES = Config.DEFAULT_NUM_QUERIES
@@ -160,7 +161,7 @@ class YouTubeQueryGenerator:
             raise ValueError("No JSON found in response")
         
         json_str = response_text[start_idx:end_idx]
-        return json.loads(json_str)
+        return _json_loads(json_str)
     
     def _validate_and_clean_queries(self, queries: list) -> list[str]:
         """Validate and clean the generated queries."""
@@ -171,8 +172,8 @@ class YouTubeQueryGenerator:
             if not query:
                 continue
                 
-            # Enforce word limit
-            words = query.split()
+            # Enforce word limit; maxsplit stops scanning once the limit is exceeded
+            words = query.split(maxsplit=QUERY_WORD_LIMIT)
             if len(words) > QUERY_WORD_LIMIT:
                 query = ' '.join(words[:QUERY_WORD_LIMIT])
                 logger.warning(f"Query truncated to {QUERY_WORD_LIMIT} words: {query}")
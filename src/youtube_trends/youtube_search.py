@@ -2,8 +2,9 @@
 
 import logging
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .config import Config
 
@@ -75,72 +76,169 @@ class YouTubeSearchClient:
         logger.info(f"Searching for videos with query: '{query}' (limit: {limit})")
         
         try:
-            # Build YouTube API client
-            youtube = self._build(
-                Config.YOUTUBE_API_SERVICE, 
-                Config.YOUTUBE_API_VERSION, 
-                developerKey=self.api_key
-            )
-            
-            # Build search parameters
-            search_params = {
-                'q': query,
-                'part': 'id,snippet',
-                'maxResults': limit,
-                'type': Config.YOUTUBE_SEARCH_PARAMS['type'],
-                'order': Config.YOUTUBE_SEARCH_PARAMS['order']  # Sort by popularity (view count)
-            }
+            youtube = self._build_client()
+            search_items = self._search_items(youtube, query, limit, published_after)
             
-            # Add date filter if provided
-            if published_after:
-                # Convert various date formats to ISO 8601
-                if len(published_after) == 4:  # YYYY format
-                    published_after += '-01-01T00:00:00Z'
-                elif len(published_after) == 7:  # YYYY-MM format  
-                    published_after += '-01T00:00:00Z'
-                elif len(published_after) == 10:  # YYYY-MM-DD format
-                    published_after += Config.YOUTUBE_DATE_SUFFIX
-                elif not published_after.endswith('Z'):  # Already has time but no Z
-                    published_after += 'Z'
-                search_params['publishedAfter'] = published_after
+            # Get video statistics and details
+            video_stats = self._fetch_video_stats(youtube, [item['id']['videoId'] for item in search_items])
             
-            # Search for videos
-            search_response = youtube.search().list(**search_params).execute()
+            return self._combine_results(query, search_items, video_stats)
             
-            if not search_response.get('items'):
-                raise SearchError(f"No results found for query: {query}")
+        except Exception as e:
+            if isinstance(e, SearchError):
+                raise
+            logger.error(f"Unexpected error during search: {e}")
+            raise SearchError(f"Failed to search videos: {str(e)}")
+    
+    def search_videos_batch(self, queries: List[str], limit: int = Config.DEFAULT_VIDEO_SEARCH_LIMIT,
+                            published_after: str = None,
+                            max_workers: int = Config.YOUTUBE_SEARCH_CONCURRENCY) -> Dict[str, Union[List[VideoResult], Exception]]:
+        """
+        Search for several queries at once, sharing the video-details lookups.
+        
+        Searches run concurrently on a thread pool; the video IDs from all of
+        them are then deduplicated and resolved with as few videos.list calls
+        as the API allows, instead of one per query.
+        
+        Args:
+            queries: Natural language search queries
+            limit: Maximum number of videos to return per query
+            published_after: Filter videos published after this date
+            max_workers: Maximum number of searches in flight at once
             
-            # Get video IDs for additional details
-            video_ids = [item['id']['videoId'] for item in search_response['items']]
+        Returns:
+            Mapping of each query to its VideoResult list, or to the SearchError raised for it
             
-            # Get video statistics and details
+        Raises:
+            SearchError: If limit is invalid or the shared video-details lookup fails
+        """
+        if limit <= 0:
+            raise SearchError("Limit must be greater than 0")
+        
+        def search(query: str) -> List[Dict]:
+            if not query.strip():
+                raise SearchError("Search query cannot be empty")
+            # API client objects are not thread-safe; build one per search
+            return self._search_items(self._build_client(), query, limit, published_after)
+        
+        logger.info(f"Searching for videos with {len(queries)} queries (limit: {limit})")
+        
+        search_results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(search, query): query for query in dict.fromkeys(queries)}
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    search_results[query] = future.result()
+                except SearchError as e:
+                    search_results[query] = e
+                except Exception as e:
+                    logger.error(f"Unexpected error during search for '{query}': {e}")
+                    search_results[query] = SearchError(f"Failed to search videos: {str(e)}")
+        
+        # One deduplicated details lookup covering every query's videos
+        video_ids = dict.fromkeys(
+            item['id']['videoId']
+            for items in search_results.values() if not isinstance(items, Exception)
+            for item in items
+        )
+        try:
+            video_stats = self._fetch_video_stats(self._build_client(), list(video_ids))
+        except Exception as e:
+            logger.error(f"Unexpected error fetching video details: {e}")
+            raise SearchError(f"Failed to search videos: {str(e)}")
+        
+        results = {}
+        for query in dict.fromkeys(queries):
+            items = search_results[query]
+            if isinstance(items, Exception):
+                results[query] = items
+                continue
+            try:
+                results[query] = self._combine_results(query, items, video_stats)
+            except SearchError as e:
+                results[query] = e
+        return results
+    
+    def _build_client(self):
+        """Build a YouTube Data API client."""
+        return self._build(
+            Config.YOUTUBE_API_SERVICE, 
+            Config.YOUTUBE_API_VERSION, 
+            developerKey=self.api_key
+        )
+    
+    def _search_items(self, youtube, query: str, limit: int, published_after: str = None) -> List[Dict]:
+        """
+        Run one search().list request and return its items.
+        
+        Raises:
+            SearchError: If the search returns no results
+        """
+        # Build search parameters
+        search_params = {
+            'q': query,
+            'part': 'id,snippet',
+            'maxResults': limit,
+            'type': Config.YOUTUBE_SEARCH_PARAMS['type'],
+            'order': Config.YOUTUBE_SEARCH_PARAMS['order']  # Sort by popularity (view count)
+        }
+        
+        # Add date filter if provided
+        if published_after:
+            # Convert various date formats to ISO 8601
+            if len(published_after) == 4:  # YYYY format
+                published_after += '-01-01T00:00:00Z'
+            elif len(published_after) == 7:  # YYYY-MM format  
+                published_after += '-01T00:00:00Z'
+            elif len(published_after) == 10:  # YYYY-MM-DD format
+                published_after += Config.YOUTUBE_DATE_SUFFIX
+            elif not published_after.endswith('Z'):  # Already has time but no Z
+                published_after += 'Z'
+            search_params['publishedAfter'] = published_after
+        
+        # Search for videos
+        search_response = youtube.search().list(**search_params).execute()
+        
+        if not search_response.get('items'):
+            raise SearchError(f"No results found for query: {query}")
+        
+        return search_response['items']
+    
+    def _fetch_video_stats(self, youtube, video_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch statistics and content details keyed by video ID, in as few videos.list calls as allowed."""
+        video_stats = {}
+        step = Config.YOUTUBE_VIDEOS_LIST_MAX_IDS
+        for start in range(0, len(video_ids), step):
             videos_response = youtube.videos().list(
                 part='statistics,contentDetails',
-                id=','.join(video_ids)
+                id=','.join(video_ids[start:start + step])
             ).execute()
-            
-            # Combine search results with video details
-            video_results = []
-            for i, item in enumerate(search_response['items']):
-                try:
-                    video_stats = videos_response['items'][i] if i < len(videos_response['items']) else {}
-                    video_result = self._parse_api_data(item, video_stats)
-                    video_results.append(video_result)
-                except Exception as e:
-                    logger.warning(f"Failed to parse video data: {e}")
-                    continue
-                    
-            if not video_results:
-                raise SearchError(f"No valid video results found for query: {query}")
+            for video in videos_response.get('items', []):
+                video_stats[video['id']] = video
+        return video_stats
+    
+    def _combine_results(self, query: str, search_items: List[Dict], video_stats: Dict[str, Dict]) -> List[VideoResult]:
+        """
+        Combine search items with their video details into VideoResult objects.
+        
+        Raises:
+            SearchError: If none of the items could be parsed
+        """
+        video_results = []
+        for item in search_items:
+            try:
+                video_result = self._parse_api_data(item, video_stats.get(item['id']['videoId'], {}))
+                video_results.append(video_result)
+            except Exception as e:
+                logger.warning(f"Failed to parse video data: {e}")
+                continue
                 
-            logger.info(f"Found {len(video_results)} videos for query: '{query}'")
-            return video_results
+        if not video_results:
+            raise SearchError(f"No valid video results found for query: {query}")
             
-        except Exception as e:
-            if isinstance(e, SearchError):
-                raise
-            logger.error(f"Unexpected error during search: {e}")
-            raise SearchError(f"Failed to search videos: {str(e)}")
+        logger.info(f"Found {len(video_results)} videos for query: '{query}'")
+        return video_results
     
     def _parse_api_data(self, search_item: Dict, video_stats: Dict) -> VideoResult:
         """
@@ -191,22 +289,25 @@ class YouTubeSearchClient:
         Returns:
             Human readable duration string
         """
-        import re
-        
-        # Parse PT4M13S format
-        match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration)
-        if not match:
+        # Parse PT4M13S format in one pass: digit runs followed by H, M, S in that order
+        if not duration.startswith('PT'):
             return duration
-            
-        hours, minutes, seconds = match.groups()
         
         parts = []
-        if hours:
-            parts.append(f"{hours}h")
-        if minutes:
-            parts.append(f"{minutes}m")
-        if seconds:
-            parts.append(f"{seconds}s")
+        next_unit = 0  # index into 'HMS' of the earliest unit still allowed
+        number_start = i = 2
+        while i < len(duration):
+            char = duration[i]
+            if char.isdecimal():
+                i += 1
+                continue
+            unit = 'HMS'.find(char, next_unit)
+            if i == number_start or unit == -1:
+                break
+            parts.append(duration[number_start:i] + char.lower())
+            next_unit = unit + 1
+            i += 1
+            number_start = i
             
         return " ".join(parts) if parts else "0s"
     
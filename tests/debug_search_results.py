@@ -32,49 +32,51 @@ def debug_search_results():
         
         query_results = []
         
-        # Test each query individually
+        # Search every query at each limit in one batch; the limit-10 batch doubles as the final results
+        batches = {
+            limit: search_client.search_videos_batch(
+                queries=query_result.queries,
+                limit=limit,
+                published_after=query_result.date
+            )
+            for limit in [5, 10, 20]
+        }
+        
+        # Report each query individually
         for i, query in enumerate(query_result.queries, 1):
             print(f"📊 Query {i}: '{query}'")
             
-            try:
-                # Search with different limits to see what happens
-                for limit in [5, 10, 20]:
-                    videos = search_client.search_videos(
-                        query=query,
-                        limit=limit,
-                        published_after=query_result.date
-                    )
-                    print(f"   Limit {limit:2d}: {len(videos)} videos found")
-                
-                # Store result for table
-                final_videos = search_client.search_videos(
-                    query=query,
-                    limit=10,
-                    published_after=query_result.date
-                )
-                
-                query_results.append({
-                    'query_number': i,
-                    'query_text': query,
-                    'videos_found': len(final_videos),
-                    'date_filter': query_result.date
-                })
-                
-                # Show first few video titles
-                if final_videos:
-                    print(f"   📹 Sample videos:")
-                    for j, video in enumerate(final_videos[:3], 1):
-                        print(f"      {j}. {video.title[:60]}...")
-                
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
+            final_videos = batches[10][query]
+            if isinstance(final_videos, Exception):
+                print(f"   ❌ Error: {final_videos}")
                 query_results.append({
                     'query_number': i,
                     'query_text': query,
                     'videos_found': 0,
                     'date_filter': query_result.date,
-                    'error': str(e)
+                    'error': str(final_videos)
                 })
+                print()
+                continue
+            
+            for limit, batch in batches.items():
+                videos = batch[query]
+                found = 0 if isinstance(videos, Exception) else len(videos)
+                print(f"   Limit {limit:2d}: {found} videos found")
+            
+            # Store result for table
+            query_results.append({
+                'query_number': i,
+                'query_text': query,
+                'videos_found': len(final_videos),
+                'date_filter': query_result.date
+            })
+            
+            # Show first few video titles
+            if final_videos:
+                print(f"   📹 Sample videos:")
+                for j, video in enumerate(final_videos[:3], 1):
+                    print(f"      {j}. {video.title[:60]}...")
             
             print()
         
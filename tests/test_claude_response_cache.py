@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Tests for the SQLite cache of raw Claude responses."""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+pytest.importorskip("tenacity")
+
+from src.youtube_trends.transcript_processing_claude import ResponseCache
+
+
+def stored_rows(cache):
+    return cache._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def test_shared_cache_is_one_instance_per_path(tmp_path):
+    path, other_path = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    cache = ResponseCache.shared(path)
+    try:
+        assert ResponseCache.shared(path) is cache
+        assert ResponseCache.shared(other_path) is not cache
+    finally:
+        ResponseCache.shared(other_path).close()
+        cache.close()
+    # A closed cache is replaced rather than handed out again
+    reopened = ResponseCache.shared(path)
+    assert reopened is not cache
+    reopened.close()
+
+
+def test_round_trip_and_expiry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    key = cache.make_key("prompt")
+    assert cache.get(key) is None
+    cache.put(key, "[]")
+    assert cache.get(key) == "[]"
+    cache.ttl = -1
+    assert cache.get(key) is None
+    cache.close()
+
+
+def test_trims_in_batches(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_entries=10)
+    for i in range(11):
+        cache.put(cache.make_key(str(i)), "[]")
+    # Trimmed to the low-water mark, newest entries kept
+    assert stored_rows(cache) == 9
+    assert cache.get(cache.make_key("10")) == "[]"
+
+    cache.put(cache.make_key("11"), "[]")
+    assert stored_rows(cache) == 10
+    cache.close()
+
+
+def test_concurrent_writers_on_separate_connections(tmp_path):
+    # Two instances stand in for two processes, each shared by several threads
+    path = str(tmp_path / "cache.db")
+    caches = [ResponseCache(path), ResponseCache(path)]
+
+    def write(worker):
+        cache = caches[worker % 2]
+        for i in range(50):
+            cache.put(cache.make_key(f"{worker}-{i}"), f"{worker}-{i}")
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stored_rows(caches[0]) == 400
+    assert caches[1].get(caches[1].make_key("3-49")) == "3-49"
+    for cache in caches:
+        cache.close()
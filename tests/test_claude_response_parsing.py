@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tests for pulling the JSON payload out of Claude responses.
+
+The original code sliced from the first '[' to the last ']'; the scanner must
+agree with it on well-formed arrays and stop at the end of the first value.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+pytest.importorskip("tenacity")
+
+from src.youtube_trends.transcript_processing_claude import _extract_json
+
+
+def baseline_extract_array(response_text):
+    """Original array extraction from the response parser."""
+    start_idx = response_text.find('[')
+    end_idx = response_text.rfind(']') + 1
+    if start_idx == -1 or end_idx == 0:
+        return None
+    return response_text[start_idx:end_idx]
+
+
+@pytest.mark.parametrize("response", [
+    '[]',
+    '[["insight", 0.5]]',
+    'Here you go:\n[["a", 0.1], ["b [nested]", -0.3]]\nDone',
+    '```json\n[["quote \\" inside", 1.0]]\n```',
+    '[["brace } in string", 0.2], {"k": [1, 2]}]',
+])
+def test_extract_json_matches_baseline_on_well_formed_arrays(response):
+    extracted = _extract_json(response, '[')
+    assert extracted == baseline_extract_array(response)
+    json.loads(extracted)
+
+
+@pytest.mark.parametrize("response, expected", [
+    ("", None),
+    ("no json here", None),
+    ('{"a": [1, 2', None),  # truncated response
+    ('{"a": 1} trailing } and ]', '{"a": 1}'),  # prose after the value is ignored
+    ('x [1] then {"b": 2}', '[1]'),  # earliest opener wins
+    ('{"s": "\\\\"}', '{"s": "\\\\"}'),  # escaped backslash before closing quote
+])
+def test_extract_json_edge_cases(response, expected):
+    assert _extract_json(response) == expected
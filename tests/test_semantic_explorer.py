@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Tests for semantic region clustering on synthetic unit-vector blobs.
+
+The original code clustered with sklearn's cosine metric; the rewrite works in
+euclidean space on unit vectors, so each test checks it against the cosine result.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("dotenv")
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from sklearn.cluster import DBSCAN, OPTICS
+from sklearn.metrics import silhouette_score
+from sklearn.neighbors import NearestNeighbors
+
+from src.youtube_trends.config import Config
+from src.youtube_trends.semantic_explorer import SemanticRegionExplorer, _score_labels, _silhouette_sample
+
+
+def make_blobs(n_blobs=4, per_blob=50, dim=32, spread=0.5, seed=0):
+    """Unit vectors scattered around n_blobs random directions, with matching trend dicts."""
+    rng = np.random.RandomState(seed)
+    centers = rng.normal(size=(n_blobs, dim))
+    points = np.repeat(centers, per_blob, axis=0) + spread * rng.normal(size=(n_blobs * per_blob, dim))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    trends = [
+        {"id": f"t{i}", "text": f"topic {i // per_blob} trend {i}",
+         "metadata": {"category": "emerging_topics", "score": 0.5, "date": "2024-01-01"}}
+        for i in range(len(points))
+    ]
+    return trends, points
+
+
+def make_explorer(trends, embeddings):
+    """Explorer over in-memory trends; with no stored index it uses exact k-NN search."""
+    explorer = SemanticRegionExplorer(vector_db=None)
+    explorer.trends_cache = trends
+    explorer.embeddings_cache = embeddings
+    return explorer
+
+
+@pytest.fixture
+def blobs():
+    return make_blobs()
+
+
+def baseline_estimate_eps(embeddings, min_samples):
+    """Original eps estimate: elbow of sorted cosine k-distances."""
+    neighbors = NearestNeighbors(n_neighbors=min_samples, metric='cosine').fit(embeddings)
+    distances, _ = neighbors.kneighbors(embeddings)
+    k_distances = np.sort(distances[:, min_samples - 1])
+    return k_distances[np.argmax(np.diff(k_distances, 2)) + 1]
+
+
+def region_summary(result):
+    return result["n_clusters"], result["noise_points"], sorted(r["size"] for r in result["dense_regions"])
+
+
+@pytest.mark.parametrize("min_samples", [3, 5, 8, 12, 20])
+def test_estimate_eps_is_the_cosine_elbow(blobs, min_samples):
+    trends, embeddings = blobs
+    explorer = make_explorer(trends, embeddings)
+    assert explorer._estimate_eps(embeddings, min_samples) == pytest.approx(
+        baseline_estimate_eps(embeddings, min_samples), rel=1e-6)
+
+
+@pytest.mark.parametrize("eps", [0.08, 0.1, 0.12, 0.15, 0.9])
+def test_dbscan_matches_cosine_dbscan(blobs, eps):
+    trends, embeddings = blobs
+    result = make_explorer(trends, embeddings).discover_dense_regions_dbscan(min_samples=5, eps=eps)
+
+    labels = DBSCAN(eps=eps, min_samples=5, metric='cosine').fit_predict(embeddings)
+    sizes = sorted(np.bincount(labels[labels != -1]).tolist()) if (labels != -1).any() else []
+    assert region_summary(result) == (len(sizes), int((labels == -1).sum()), sizes)
+
+
+@pytest.fixture
+def full_sweep(monkeypatch):
+    """Fit every adaptive candidate, in process, so whole sweeps can be compared."""
+    monkeypatch.setattr(Config, "CLUSTERING_EARLY_STOP_SILHOUETTE", 2.0)
+    monkeypatch.setattr(Config, "CLUSTERING_ADAPTIVE_N_JOBS", 1)
+
+
+def baseline_labels(algorithm, params, embeddings):
+    if algorithm == "DBSCAN":
+        return DBSCAN(eps=params["eps"], min_samples=params["min_samples"], metric='cosine').fit_predict(embeddings)
+    return OPTICS(min_samples=params["min_samples"], xi=params["xi"], metric='cosine').fit_predict(embeddings)
+
+
+def test_adaptive_candidates_match_cosine_sklearn(blobs, full_sweep):
+    trends, embeddings = blobs
+    result = make_explorer(trends, embeddings).discover_dense_regions_adaptive()
+
+    alternatives = result["algorithm_comparison"]["alternative_algorithms"]
+    assert alternatives
+    for algorithm, labels, _, params in alternatives:
+        np.testing.assert_array_equal(labels, baseline_labels(algorithm, params, embeddings))
+
+
+def test_adaptive_without_dense_matrix_matches(blobs, full_sweep, monkeypatch):
+    trends, embeddings = blobs
+    dense = make_explorer(trends, embeddings).discover_dense_regions_adaptive()
+    # Over budget, OPTICS lets sklearn compute cosine distances instead of sharing an N x N matrix
+    monkeypatch.setattr(Config, "CLUSTERING_DENSE_MATRIX_MAX_BYTES", 0)
+    chunked = make_explorer(trends, embeddings).discover_dense_regions_adaptive()
+
+    for key in ("best_algorithm", "best_parameters", "algorithms_tried"):
+        assert chunked["algorithm_comparison"][key] == dense["algorithm_comparison"][key]
+    assert chunked["algorithm_comparison"]["best_silhouette_score"] == pytest.approx(
+        dense["algorithm_comparison"]["best_silhouette_score"])
+    assert region_summary(chunked) == region_summary(dense)
+
+
+def cosine_silhouette(embeddings, labels):
+    keep = labels != -1
+    return silhouette_score(embeddings[keep], labels[keep], metric='cosine')
+
+
+@pytest.mark.parametrize("eps", [0.1, 0.12, 0.15])
+def test_silhouette_sample_covering_all_points_is_exact(blobs, eps):
+    _, embeddings = blobs
+    labels = DBSCAN(eps=eps, min_samples=5, metric='cosine').fit_predict(embeddings)
+    sample, sample_distances = _silhouette_sample(embeddings)
+    assert sample.size == len(embeddings)
+
+    scored = _score_labels("DBSCAN", labels, sample, sample_distances, {}, max_clusters=20)
+    assert scored[2] == pytest.approx(cosine_silhouette(embeddings, labels), abs=1e-6)
+
+
+def test_silhouette_subsample_estimates_full_score(monkeypatch):
+    _, embeddings = make_blobs(per_blob=250)
+    labels = DBSCAN(eps=0.12, min_samples=5, metric='cosine').fit_predict(embeddings)
+    monkeypatch.setattr(Config, "CLUSTERING_SILHOUETTE_SAMPLE_SIZE", 400)
+    sample, sample_distances = _silhouette_sample(embeddings)
+    assert sample.size == 400
+    np.testing.assert_array_equal(sample, _silhouette_sample(embeddings)[0])
+
+    scored = _score_labels("DBSCAN", labels, sample, sample_distances, {}, max_clusters=20)
+    assert scored[2] == pytest.approx(cosine_silhouette(embeddings, labels), abs=0.05)
+
+
+def test_adaptive_stops_early_on_clear_clusters(monkeypatch):
+    trends, embeddings = make_blobs(spread=0.2)
+    monkeypatch.setattr(Config, "CLUSTERING_ADAPTIVE_N_JOBS", 1)
+    threshold = Config.CLUSTERING_EARLY_STOP_SILHOUETTE
+    stopped = make_explorer(trends, embeddings).discover_dense_regions_adaptive()
+    monkeypatch.setattr(Config, "CLUSTERING_EARLY_STOP_SILHOUETTE", 2.0)
+    swept = make_explorer(trends, embeddings).discover_dense_regions_adaptive()
+
+    comparison = stopped["algorithm_comparison"]
+    assert comparison["algorithms_tried"] < swept["algorithm_comparison"]["algorithms_tried"]
+    assert comparison["best_silhouette_score"] >= threshold
+    assert stopped["n_clusters"] == 4
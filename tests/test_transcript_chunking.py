@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Tests for transcript chunking against the original character-by-character code.
+
+Sentence splitting and chunk boundaries decide what each extraction call sees,
+so the rewritten chunkers are checked against the original implementations below.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+
+from src.youtube_trends.config import Config
+from src.youtube_trends.transcript_processing import TranscriptChunker
+
+
+def baseline_split_sentences(text):
+    """Original _split_sentences, lifted out of the chunker."""
+    sentences = []
+    current = ""
+    for char in text:
+        current += char
+        if char in Config.SENTENCE_DELIMITERS and len(current.strip()) > Config.TRANSCRIPT_MIN_SENTENCE_LENGTH:
+            sentences.append(current.strip() + " ")
+            current = ""
+    if current.strip():
+        sentences.append(current.strip())
+    return sentences
+
+
+def baseline_create_overlap(chunk, overlap_size):
+    """Original _create_overlap."""
+    if len(chunk) <= overlap_size:
+        return chunk
+    overlap = chunk[-overlap_size:]
+    space_idx = overlap.find(' ')
+    if space_idx > 0:
+        overlap = overlap[space_idx:]
+    return overlap.strip() + " "
+
+
+def baseline_chunk_parts(transcript, max_chunk_size, overlap_size):
+    """Original chunk_transcript, returning (overlap, core) pairs so the context split can be checked."""
+    if len(transcript) <= max_chunk_size:
+        return [("", transcript)]
+    chunks = []
+    current_chunk = ""
+    overlap_buffer = ""
+    for sentence in baseline_split_sentences(transcript):
+        if len(current_chunk + sentence) > max_chunk_size and current_chunk:
+            chunks.append((overlap_buffer, current_chunk))
+            overlap_buffer = baseline_create_overlap(current_chunk, overlap_size)
+            current_chunk = sentence
+        else:
+            current_chunk += sentence
+    if current_chunk:
+        chunks.append((overlap_buffer, current_chunk))
+    return chunks
+
+
+TEXTS = [
+    "",
+    "Hi.",
+    "   ",
+    "No delimiters at all here just words",
+    "   leading spaces. and. tiny. bits.  ",
+    "Short one. Another short one! And a question? Trailing text without delimiter",
+    "Ünïcödé sentence here. Ça va très bien! Ещё одно предложение?",
+    " ".join(f"Sentence number {i} talks about topic {i % 7} in some detail." for i in range(60)),
+    " ".join(f"Point {i} is here." for i in range(40)),
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_split_sentences_matches_baseline(text):
+    assert TranscriptChunker()._split_sentences(text) == baseline_split_sentences(text)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_iter_chunks_matches_chunk_transcript(text):
+    chunker = TranscriptChunker(max_chunk_size=300, overlap_size=50)
+    assert list(chunker.iter_chunks(text)) == chunker.chunk_transcript(text)
+
+
+def test_iter_chunks_is_lazy(monkeypatch):
+    text = TEXTS[-2] * 50
+    chunker = TranscriptChunker(max_chunk_size=300, overlap_size=50)
+    consumed = []
+    iter_sentences = chunker._iter_sentences
+
+    def counting_iter_sentences(transcript):
+        for sentence in iter_sentences(transcript):
+            consumed.append(sentence)
+            yield sentence
+
+    monkeypatch.setattr(chunker, "_iter_sentences", counting_iter_sentences)
+    overlap, core = baseline_chunk_parts(text, 300, 50)[0]
+
+    assert next(chunker.iter_chunks(text)) == overlap + core
+    # The first chunk is ready long before the whole transcript has been split
+    assert len(consumed) < len(baseline_split_sentences(text)) // 10
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_iter_chunks_matches_baseline_with_tail_merge(text):
+    chunker = TranscriptChunker(max_chunk_size=300, overlap_size=50)
+
+    parts = baseline_chunk_parts(text, 300, 50)
+    expected = [overlap + core for overlap, core in parts]
+    # A short final tail is folded into the previous chunk rather than sent on its own
+    if len(parts) > 1 and len(parts[-1][1]) < Config.TRANSCRIPT_MIN_TAIL_FRACTION * 300:
+        expected = expected[:-2] + [expected[-2] + parts[-1][1]]
+
+    assert list(chunker.iter_chunks(text)) == expected
+
+
+def test_iter_chunks_merges_short_tail():
+    chunker = TranscriptChunker(max_chunk_size=95, overlap_size=20)
+    text = "This sentence is exactly forty four chars. " * 4 + "Short tail."
+
+    chunks = list(chunker.iter_chunks(text))
+
+    assert len(chunks) == len(baseline_chunk_parts(text, 95, 20)) - 1
+    assert chunks[-1].endswith("chars. Short tail. ")
+
+
+def test_iter_chunks_keeps_long_tail():
+    chunker = TranscriptChunker(max_chunk_size=95, overlap_size=20)
+    text = "This sentence is exactly forty four chars. " * 5
+
+    assert list(chunker.iter_chunks(text)) == [o + c for o, c in baseline_chunk_parts(text, 95, 20)]
+
+
+@pytest.mark.parametrize("overlap_size", [0, 1, 7, 25, 50, 200, 10_000])
+def test_create_overlap_matches_baseline(overlap_size):
+    chunker = TranscriptChunker(overlap_size=overlap_size)
+    for text in TEXTS:
+        sentences = baseline_split_sentences(text)
+        for end in range(1, len(sentences) + 1):
+            chunk = "".join(sentences[:end])
+            assert chunker._create_overlap(chunk) == baseline_create_overlap(chunk, overlap_size)
+
+
+@pytest.fixture(scope="module")
+def claude_chunker():
+    pytest.importorskip("tenacity")
+    from src.youtube_trends.transcript_processing_claude import TranscriptChunker as ClaudeTranscriptChunker
+    return ClaudeTranscriptChunker(max_chunk_size=300, overlap_size=50)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_claude_split_sentences_matches_baseline(claude_chunker, text):
+    assert claude_chunker._split_sentences(text) == baseline_split_sentences(text)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_claude_chunk_transcript_matches_baseline(claude_chunker, text):
+    assert claude_chunker.chunk_transcript(text) == [o + c for o, c in baseline_chunk_parts(text, 300, 50)]
+
+
+@pytest.mark.parametrize("overlap_size", [0, 1, 7, 25, 50, 200, 10_000])
+def test_claude_overlap_from_tail_matches_whole_chunk(overlap_size):
+    pytest.importorskip("tenacity")
+    from src.youtube_trends.transcript_processing_claude import TranscriptChunker as ClaudeTranscriptChunker
+    chunker = ClaudeTranscriptChunker(overlap_size=overlap_size)
+
+    for text in TEXTS:
+        sentences = baseline_split_sentences(text)
+        for end in range(1, len(sentences) + 1):
+            chunk = "".join(sentences[:end])
+            assert chunker._create_overlap(chunker._tail(sentences[:end])) == \
+                baseline_create_overlap(chunk, overlap_size)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_claude_chunk_parts_keep_overlap_separate(claude_chunker, text):
+    parts = claude_chunker.chunk_transcript_parts(text)
+    assert parts == baseline_chunk_parts(text, 300, 50)
+    # Only later chunks carry context from the previous one
+    assert parts[0][0] == ""
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Tests for the trends vector database on a real ChromaDB store in a temp directory.
+
+Tools and older versions add rows straight to the collection, so each indexed
+feature is also checked against rows written behind the database's back.
+"""
+
+import hashlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("dotenv")
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("chromadb")
+
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils import embedding_functions
+
+from src.youtube_trends.config import Config
+from src.youtube_trends.trends_vector_db import TrendsVectorDB
+
+
+class HashEmbedding(EmbeddingFunction[Documents]):
+    """Bag-of-words hashing embedder, so tests need no model download."""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings = []
+        for text in input:
+            vector = np.zeros(32, dtype=np.float32)
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 32] += 1
+            embeddings.append(vector / (np.linalg.norm(vector) or 1))
+        return embeddings
+
+    @staticmethod
+    def name():
+        return "hash_test"
+
+    def get_config(self):
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return HashEmbedding()
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_functions, "DefaultEmbeddingFunction", HashEmbedding)
+    # Small pages so backfill and score scans cross page boundaries
+    monkeypatch.setattr(Config, "VECTOR_DB_ADD_BATCH_SIZE", 4)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def db(db_path):
+    return TrendsVectorDB(db_path)
+
+
+def trend_rows(dates, prefix="t", category="emerging_topics", score=0.5):
+    """ids, documents and metadatas as the tools build them: no indexed fields."""
+    ids = [f"{prefix}{i}" for i in range(len(dates))]
+    documents = [f"{category} trend {prefix} {i} about topic {i % 3}" for i in range(len(dates))]
+    metadatas = [{"category": category, "score": score, "date": date, "run_id": "run"} for date in dates]
+    return ids, documents, metadatas
+
+
+def add_directly(db, ids, documents, metadatas):
+    """Write rows the way the tools used to, bypassing TrendsVectorDB."""
+    db.collection.add(ids=ids, documents=documents, metadatas=metadatas)
+
+
+def found_ids(results):
+    return sorted(result["id"] for result in results)
+
+
+# --- Date filters --------------------------------------------------------------
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"category": None, "min_score": None, "after_date": None, "before_date": None},
+    {"category": "", "after_date": "", "before_date": ""},
+])
+def test_build_where_unfiltered_is_none(kwargs):
+    assert TrendsVectorDB._build_where(**kwargs) is None
+
+
+def test_build_where_single_condition_is_not_wrapped():
+    assert TrendsVectorDB._build_where(category="tech") == {"category": "tech"}
+    assert TrendsVectorDB._build_where(min_score=0) == {"score": {"$gte": 0}}
+
+
+def test_build_where_combines_all_filters():
+    assert TrendsVectorDB._build_where("tech", 0.5, "2024-01-01", "2024-12-31") == {"$and": [
+        {"category": "tech"},
+        {"score": {"$gte": 0.5}},
+        {"date_ordinal": {"$gte": 20240101}},
+        {"date_ordinal": {"$lte": 20241231}},
+    ]}
+
+
+def test_build_where_date_bound_excludes_undated():
+    # Undated trends are stored with date_ordinal 0 and never matched a date range
+    assert TrendsVectorDB._build_where(before_date="2024-06-30") == {"$and": [
+        {"date_ordinal": {"$gte": 1}},
+        {"date_ordinal": {"$lte": 20240630}},
+    ]}
+
+
+DATES = ["2024-01-05", "2024-03-10", "", "10/18/23", "2024-06-30"]
+
+
+def test_date_filters_on_added_trends(db):
+    assert db.add_trends(*trend_rows(DATES)) == []
+
+    assert found_ids(db.search("trend", top_k=10, after_date="2024-02-01")) == ["t1", "t4"]
+    assert found_ids(db.search("trend", top_k=10, before_date="2024-01-31")) == ["t0", "t3"]
+    assert found_ids(db.get_trending_topics(min_score=0, after_date="2023-10-18", before_date="2024-01-05")) == \
+        ["t0", "t3"]
+
+
+def test_date_filters_see_rows_added_directly(db, db_path):
+    db.add_trends(*trend_rows(DATES[:2]))
+    assert found_ids(db.search("trend", top_k=10, after_date="2024-02-01")) == ["t1"]
+
+    add_directly(db, *trend_rows(DATES, prefix="direct"))
+
+    assert found_ids(db.search("trend", top_k=10, after_date="2024-02-01")) == ["direct1", "direct4", "t1"]
+    assert found_ids(db.get_trending_topics(min_score=0, before_date="2024-01-31")) == ["direct0", "direct3", "t0"]
+
+    # Rows written while no instance was looking are backfilled when the next one opens
+    add_directly(db, *trend_rows(["2023-05-01"], prefix="later"))
+    reopened = TrendsVectorDB(db_path)
+    assert found_ids(reopened.get_trending_topics(min_score=0, before_date="2023-12-31")) == ["direct3", "later0"]
+
+
+# --- Manual grading ------------------------------------------------------------
+
+def test_grading_queries_see_rows_added_directly(db):
+    db.add_trends(*trend_rows(DATES[:2]))
+    assert db.get_grading_stats()["ungraded"] == 2
+
+    add_directly(db, *trend_rows(DATES, prefix="direct"))
+    assert db.add_manual_grade("direct0", True)
+    assert db.add_manual_grade("t1", False)
+
+    assert found_ids(db.get_graded_trends()) == ["direct0", "t1"]
+    assert found_ids(db.get_graded_trends(interesting_only=True)) == ["direct0"]
+    assert found_ids(db.get_ungraded_trends(limit=100)) == ["direct1", "direct2", "direct3", "direct4", "t0"]
+    stats = db.get_grading_stats()
+    assert (stats["total_trends"], stats["graded"], stats["ungraded"], stats["interesting"]) == (7, 2, 5, 1)
+
+
+def test_legacy_grades_are_backfilled_on_open(db_path):
+    legacy = TrendsVectorDB(db_path)
+    ids, documents, metadatas = trend_rows(DATES, prefix="old")
+    metadatas[2]["manual_grade"] = True
+    metadatas[3]["manual_grade"] = False
+    add_directly(legacy, ids, documents, metadatas)
+
+    db = TrendsVectorDB(db_path)
+
+    assert found_ids(db.get_graded_trends()) == ["old2", "old3"]
+    assert found_ids(db.get_graded_trends(interesting_only=False)) == ["old3"]
+    assert found_ids(db.get_ungraded_trends(limit=100)) == ["old0", "old1", "old4"]
+
+
+# --- Search cache --------------------------------------------------------------
+
+def test_search_cache_returns_copies(db):
+    db.add_trends(*trend_rows(DATES))
+    first = db.search("topic 1", top_k=3)
+    first[0]["metadata"]["category"] = "mutated"
+    first.clear()
+
+    again = db.search("topic 1", top_k=3)
+    assert len(again) == 3
+    assert all(result["metadata"]["category"] == "emerging_topics" for result in again)
+
+
+def test_search_cache_drops_results_after_outside_writes(db, db_path):
+    db.add_trends(*trend_rows(DATES[:2]))
+    assert found_ids(db.search("trend", top_k=10)) == ["t0", "t1"]
+
+    add_directly(db, *trend_rows(DATES[:1], prefix="direct"))
+    assert found_ids(db.search("trend", top_k=10)) == ["direct0", "t0", "t1"]
+
+    # Another instance on the same store
+    TrendsVectorDB(db_path).add_trends(*trend_rows(DATES[:1], prefix="other"))
+    assert found_ids(db.search("trend", top_k=10)) == ["direct0", "other0", "t0", "t1"]
+
+
+# --- Score column --------------------------------------------------------------
+
+def score_rows(scores, prefix):
+    ids, documents, metadatas = trend_rows(["2024-01-01"] * len(scores), prefix=prefix)
+    for metadata, score in zip(metadatas, scores):
+        metadata["score"] = score
+    return ids, documents, metadatas
+
+
+def score_counts(db):
+    distribution = db.get_stats()["score_distribution"]
+    return distribution["high (>0.7)"], distribution["medium (0.3-0.7)"], distribution["low (<0.3)"]
+
+
+def test_score_column_is_built_lazily(db, db_path):
+    db.add_trends(*score_rows([0.1, 0.5, 0.9], "a"))
+    scores_file = os.path.join(db_path, Config.FILES["score_column"])
+
+    reopened = TrendsVectorDB(db_path)
+    assert reopened._scores is None and not os.path.exists(scores_file)
+
+    assert score_counts(reopened) == (1, 1, 1)
+    saved = os.path.getmtime(scores_file)
+    # A later instance reuses the saved column while the collection is unchanged
+    assert score_counts(TrendsVectorDB(db_path)) == (1, 1, 1)
+    assert os.path.getmtime(scores_file) == saved
+
+
+def test_score_column_follows_adds(db):
+    db.add_trends(*score_rows([0.1, 0.5, 0.9], "a"))
+    assert score_counts(db) == (1, 1, 1)
+
+    # Adds through the class extend the column in place
+    db.add_trends(*score_rows([0.95, 0.8], "b"))
+    assert db._scores_fingerprint == db._collection_fingerprint()
+    assert score_counts(db) == (3, 1, 1)
+
+    # Rows added behind its back invalidate it
+    add_directly(db, *score_rows([0.2, 0.25], "c"))
+    assert score_counts(db) == (3, 1, 3)
+    assert db.get_stats()["score_distribution"]["average"] == pytest.approx(
+        np.mean([0.1, 0.5, 0.9, 0.95, 0.8, 0.2, 0.25]))
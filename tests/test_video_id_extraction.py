@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Tests for YouTube video ID extraction against the original urlparse/parse_qs code.
+
+The regex fast path must never disagree with the parser it short-circuits, so
+each URL is checked against the original implementation kept below.
+"""
+
+import os
+import sys
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("youtube_transcript_api")
+
+from src.youtube_trends.config import Config
+from src.youtube_trends.transcript_client import YouTubeTranscriptClient, _YT_ID_RE, _query_param
+
+
+def baseline_extract_video_id(url):
+    """Original extract_video_id, lifted out of the client."""
+    if not url:
+        return None
+    if len(url) == Config.YOUTUBE_VIDEO_ID_LENGTH and url.isalnum():
+        return url
+    try:
+        parsed_url = urlparse(url)
+        if parsed_url.hostname in Config.YOUTUBE_DOMAINS:
+            if parsed_url.path == Config.YOUTUBE_WATCH_PATH:
+                return parse_qs(parsed_url.query).get('v', [None])[0]
+            elif parsed_url.path.startswith(Config.YOUTUBE_EMBED_PATH):
+                return parsed_url.path.split(Config.YOUTUBE_EMBED_PATH)[1].split('?')[0]
+        elif parsed_url.hostname in Config.YOUTUBE_SHORT_DOMAINS:
+            return parsed_url.path.lstrip('/')
+    except Exception:
+        pass
+    return None
+
+
+VIDEO_URLS = [
+    "",
+    "dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ?t=42",
+    "https://youtu.be/dQw4w9WgXcQ?si=abc&t=1",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=1",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ#t=3",
+    "https://www.youtube.com/watch?v=&v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=a%20b",
+    "https://www.youtube.com/watch?v=short",
+    "https://www.youtube.com/watch?v=",
+    "https://www.youtube.com/watch?list=x",
+    "https://youtube.com/embed/dQw4w9WgXcQ?start=5",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://example.com/watch?v=dQw4w9WgXcQ",
+    "not a url",
+    # The first non-empty v= wins, even when a later one looks like an ID
+    "https://www.youtube.com/watch?v=short&v=AAAAAAAAAAA",
+    "https://www.youtube.com/watch?v=AAAAAAAAAAAA&v=BBBBBBBBBBB",
+    "https://www.youtube.com/watch?v=AAAAAAAAAA&v=BBBBBBBBBBB",
+    "https://www.youtube.com/watch?v=AAAAAAAA%41A&v=BBBBBBBBBBB",
+    "https://www.youtube.com/watch?v=AAAAAAAA+AA&v=BBBBBBBBBBB",
+    "https://www.youtube.com/watch?vv=AAAAAAAAAAA&v=short",
+    "https://www.youtube.com/watch?a=v=AAAAAAAAAAA&v=short",
+    "https://www.youtube.com/watch?v=AAAAAAAAAAA&v=BBBBBBBBBBB",
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Extraction needs no API client
+    return YouTubeTranscriptClient.__new__(YouTubeTranscriptClient)
+
+
+@pytest.mark.parametrize("url", VIDEO_URLS)
+def test_extract_video_id_matches_baseline(client, url):
+    assert client.extract_video_id(url) == baseline_extract_video_id(url)
+
+
+def test_first_short_v_is_not_skipped(client):
+    assert client.extract_video_id("https://www.youtube.com/watch?v=short&v=AAAAAAAAAAA") == "short"
+
+
+@pytest.mark.parametrize("url", [u for u in VIDEO_URLS if _YT_ID_RE.match(u)])
+def test_fast_path_agrees_with_parser(url):
+    match = _YT_ID_RE.match(url)
+    assert next(g for g in match.groups() if g) == baseline_extract_video_id(url)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("", None),
+    ("v=", None),
+    ("v=&v=abc", "abc"),
+    ("a=1&v=x%2By&v=z", "x+y"),
+    ("vv=1&v=2", "2"),
+    ("v=a+b", "a b"),
+    ("v", None),
+    ("v=1;v=2", "1;v=2"),
+])
+def test_query_param_matches_parse_qs(query, expected):
+    assert _query_param(query, "v") == expected == parse_qs(query).get("v", [None])[0]
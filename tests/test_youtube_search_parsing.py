@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Tests for YouTube search response parsing that need no API key or network.
+
+The duration scanner replaced a regex, so it is checked against the original below;
+search items are joined to their statistics by video ID.
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("dotenv")
+
+from src.youtube_trends.youtube_search import SearchError, YouTubeSearchClient
+
+
+def baseline_parse_duration(duration):
+    """Original _parse_duration, lifted out of the client."""
+    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?', duration)
+    if not match:
+        return duration
+    hours, minutes, seconds = match.groups()
+    parts = []
+    if hours:
+        parts.append(f"{hours}h")
+    if minutes:
+        parts.append(f"{minutes}m")
+    if seconds:
+        parts.append(f"{seconds}s")
+    return " ".join(parts) if parts else "0s"
+
+
+DURATIONS = ["", "PT", "PT0S", "PT5S", "PT1H", "PT10M", "PT2H5S", "PT4M13S", "PT1H2M3S",
+             "PT1H0M0S", "PT0H0M", "PT01M", "PT1.5S", "P1D", "garbage",
+             "PT1S1M", "PT1H2H", "PTH", "PT5M trailing", "P1DT2H", "PT١M"]
+
+
+@pytest.fixture(scope="module")
+def search_client():
+    # Parsing helpers need no API key or client
+    return YouTubeSearchClient.__new__(YouTubeSearchClient)
+
+
+@pytest.mark.parametrize("duration", DURATIONS)
+def test_parse_duration_matches_baseline(search_client, duration):
+    assert search_client._parse_duration(duration) == baseline_parse_duration(duration)
+
+
+def search_item(video_id, title="Title"):
+    return {"id": {"videoId": video_id}, "snippet": {"title": title, "channelTitle": "Channel"}}
+
+
+def test_combine_results_matches_stats_by_id(search_client):
+    items = [search_item("aaaaaaaaaaa", "A"), search_item("bbbbbbbbbbb", "B")]
+    # The videos endpoint may return fewer items, in any order
+    stats = {"bbbbbbbbbbb": {"contentDetails": {"duration": "PT1H"}, "statistics": {"viewCount": "1234"}}}
+
+    results = search_client._combine_results("query", items, stats)
+
+    assert [r.title for r in results] == ["A", "B"]
+    assert (results[0].duration, results[0].views) == ("Unknown", "0 views")
+    assert (results[1].duration, results[1].views) == ("1h", "1,234 views")
+
+
+def test_combine_results_skips_unparseable_items(search_client):
+    items = [{"snippet": {}}, search_item("aaaaaaaaaaa")]
+    results = search_client._combine_results("query", items, {})
+    assert [r.video_id for r in results] == ["aaaaaaaaaaa"]
+
+
+def test_combine_results_raises_when_nothing_parses(search_client):
+    with pytest.raises(SearchError):
+        search_client._combine_results("query", [{"snippet": {}}], {})
@@ -175,12 +175,11 @@ class SingleVideoTrendTester:
                 metadatas.append(metadata)
                 ids.append(trend_id)
             
-            # Add to database
-            self.vector_db.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            # Add through the database so the indexed metadata filters rely on is filled in
+            failed_batches = self.vector_db.add_trends(ids, documents, metadatas)
+            if failed_batches:
+                print(f"❌ Failed to load {len(failed_batches)} batch(es) of trends")
+                return False
             
             print(f"✅ Successfully loaded {len(trends)} trends to database")
             return True